@@ -1,10 +1,22 @@
+import math
+import os
+import sys
+import threading
 import time
-from typing import Optional, List
+import tracemalloc
+from itertools import chain
+from typing import Iterable, Iterator, Optional, List, Set, Tuple
+
+from roster_format import RosterFile, write_roster
 
 class Student:
+    # __slots__ убирает у каждого объекта словарь атрибутов, а номер группы
+    # интернируется: у тысяч студентов одной группы будет одна строка на всех
+    __slots__ = ('full_name', 'group_number', 'course', 'age', 'average_grade')
+
     def __init__(self, full_name: str, group_number: str, course: int, age: int, average_grade: float) -> None:
         self.full_name = full_name
-        self.group_number = group_number
+        self.group_number = sys.intern(group_number)
         self.course = course
         self.age = age
         self.average_grade = average_grade
@@ -13,177 +25,809 @@ class Student:
         return f"Student({self.full_name}, {self.group_number}, {self.course}, {self.age}, {self.average_grade})"
 
 class AVLNode:
+    # Узел хранит корзину всех студентов с одинаковой оценкой, поэтому число
+    # узлов равно числу различных оценок
+    __slots__ = ('grade', 'students', 'left', 'right', 'height', 'size')
+
     def __init__(self, student: Student) -> None:
-        self.student = student
+        self.grade: float = student.average_grade
+        self.students: List[Student] = [student]
         self.left: Optional[AVLNode] = None
         self.right: Optional[AVLNode] = None
         self.height: int = 1
+        self.size: int = 1  # число студентов в поддереве вместе с корзиной узла
+
+    @property
+    def student(self) -> Student:
+        return self.students[0]
+
+BUCKET_CHUNK = 64
+
+class PersistentBucket:
+    # Неизменяемая корзина для режима persistent. Студенты лежат кусками (кортежами)
+    # не длиннее BUCKET_CHUNK, и новая версия копирует только список кусков и один
+    # изменённый кусок, а остальные куски делит со старыми версиями. Запись в корзину
+    # из k студентов стоит O(k / BUCKET_CHUNK + BUCKET_CHUNK) вместо O(k)
+    __slots__ = ('chunks', 'length')
+
+    def __init__(self, chunks: Tuple[Tuple[Student, ...], ...] = (), length: int = 0) -> None:
+        self.chunks = chunks
+        self.length = length
+
+    @classmethod
+    def of(cls, students) -> 'PersistentBucket':
+        if isinstance(students, PersistentBucket):
+            return students
+        return cls(tuple(tuple(students[i:i + BUCKET_CHUNK]) for i in range(0, len(students), BUCKET_CHUNK)),
+                   len(students))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[Student]:
+        return chain.from_iterable(self.chunks)
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("Номер студента вне корзины")
+        last = self.chunks[-1]
+        if index >= self.length - len(last):
+            # delete() без ФИО снимает последнего студента - частый случай без обхода
+            return len(self.chunks) - 1, index - self.length + len(last)
+        for number, chunk in enumerate(self.chunks):
+            if index < len(chunk):
+                return number, index
+            index -= len(chunk)
+        raise IndexError("Номер студента вне корзины")
+
+    def __getitem__(self, index: int) -> Student:
+        number, offset = self._locate(index)
+        return self.chunks[number][offset]
+
+    def appended(self, student: Student) -> 'PersistentBucket':
+        chunks = self.chunks
+        if chunks and len(chunks[-1]) < BUCKET_CHUNK:
+            return PersistentBucket(chunks[:-1] + (chunks[-1] + (student,),), self.length + 1)
+        return PersistentBucket(chunks + ((student,),), self.length + 1)
+
+    def without(self, index: int) -> 'PersistentBucket':
+        number, offset = self._locate(index)
+        chunk = self.chunks[number]
+        rest = (chunk[:offset] + chunk[offset + 1:],) if len(chunk) > 1 else ()
+        return PersistentBucket(self.chunks[:number] + rest + self.chunks[number + 1:], self.length - 1)
 
 class AVLTree:
-    def __init__(self) -> None:
+    # В режиме persistent узлы никогда не меняются на месте: insert/delete копируют
+    # узлы на пути от корня (path copying) и устанавливают новый корень, а
+    # неизменённые поддеревья разделяются со старыми версиями. Поэтому snapshot()
+    # стоит O(1), и читатели снимка не мешают писателю
+    def __init__(self, persistent: bool = False) -> None:
         self.root: Optional[AVLNode] = None
+        self.persistent = persistent
+        self._fresh: Set[int] = set()  # id узлов, скопированных в текущей операции
+
+    def snapshot(self) -> 'AVLTree':
+        if not self.persistent:
+            raise ValueError("Снимок доступен только для дерева в режиме persistent")
+        tree = AVLTree(persistent=True)
+        tree.root = self.root
+        return tree
+
+    def _own(self, node: AVLNode) -> AVLNode:
+        # Узел, который можно менять в текущей операции: в обычном режиме сам узел,
+        # в режиме persistent - его копия (корзина разделяется до первого изменения)
+        if not self.persistent or id(node) in self._fresh:
+            return node
+        copy = AVLNode.__new__(AVLNode)
+        copy.grade = node.grade
+        copy.students = node.students
+        copy.left = node.left
+        copy.right = node.right
+        copy.height = node.height
+        copy.size = node.size
+        self._fresh.add(id(copy))
+        return copy
+
+    @property
+    def size(self) -> int:
+        return self.root.size if self.root else 0
+
+    def __len__(self) -> int:
+        return self.size
 
     def _height(self, node: Optional[AVLNode]) -> int:
         return node.height if node else 0
 
+    def _size(self, node: Optional[AVLNode]) -> int:
+        return node.size if node else 0
+
+    def _update(self, node: AVLNode) -> None:
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        node.size = self._size(node.left) + len(node.students) + self._size(node.right)
+
     def _balance_factor(self, node: Optional[AVLNode]) -> int:
         return self._height(node.left) - self._height(node.right)
 
     def _rotate_right(self, y: AVLNode) -> AVLNode:
-        x = y.left
-        if x is None:
+        if y.left is None:
             return y  # No rotation possible
+        y = self._own(y)
+        x = self._own(y.left)
         T2 = x.right
         x.right = y
         y.left = T2
-        y.height = 1 + max(self._height(y.left), self._height(y.right)) # пересчитываются высоты узлов
-        x.height = 1 + max(self._height(x.left), self._height(x.right))
+        self._update(y)  # пересчитываются высоты и размеры узлов
+        self._update(x)
         return x
 
     def _rotate_left(self, x: AVLNode) -> AVLNode:
-        y = x.right
-        if y is None:
+        if x.right is None:
             return x  # No rotation possible
+        x = self._own(x)
+        y = self._own(x.right)
         T2 = y.left
         y.left = x
         x.right = T2
-        x.height = 1 + max(self._height(x.left), self._height(x.right))
-        y.height = 1 + max(self._height(y.left), self._height(y.right))
+        self._update(x)
+        self._update(y)
         return y
 
-    def _insert(self, node: Optional[AVLNode], student: Student) -> AVLNode:
-        if not node:
-            return AVLNode(student)
-
-        if student.average_grade < node.student.average_grade:
-            node.left = self._insert(node.left, student)
-        else:
-            node.right = self._insert(node.right, student)
+    def _rebalance(self, node: AVLNode) -> AVLNode:
+        # Пересчитывает высоту узла и выполняет нужный поворот (LL, RR, LR, RL)
+        left, right = node.left, node.right
+        left_height = left.height if left else 0
+        right_height = right.height if right else 0
 
-        node.height = 1 + max(self._height(node.left), self._height(node.right))
-        balance = self._balance_factor(node)
-
-        if balance > 1 and student.average_grade < node.left.student.average_grade:
+        if left_height - right_height > 1:
+            if self._balance_factor(left) < 0:
+                node.left = self._rotate_left(left)
             return self._rotate_right(node)
 
-        if balance < -1 and student.average_grade > node.right.student.average_grade:
+        if right_height - left_height > 1:
+            if self._balance_factor(right) > 0:
+                node.right = self._rotate_right(right)
             return self._rotate_left(node)
 
-        if balance > 1 and student.average_grade > node.left.student.average_grade:
-            node.left = self._rotate_left(node.left)
-            return self._rotate_right(node)
+        node.height = 1 + (left_height if left_height > right_height else right_height)
+        node.size = (left.size if left else 0) + len(node.students) + (right.size if right else 0)
+        return node
 
-        if balance < -1 and student.average_grade < node.right.student.average_grade:
-            node.right = self._rotate_right(node.right)
-            return self._rotate_left(node)
+    def _fix_path(self, path: List[Tuple[AVLNode, bool]], child: Optional[AVLNode]) -> None:
+        # Поднимаемся по сохранённому пути от места изменения к корню:
+        # подвешиваем новое поддерево к родителю и балансируем родителя.
+        # Второй элемент пары - спускались ли мы из узла влево
+        index = len(path) - 1
+        while index >= 0:
+            original, went_left = path[index]
+            node = self._own(original)
+            if went_left:
+                node.left = child
+            else:
+                node.right = child
+            height = node.height
+            child = self._rebalance(node)
+            index -= 1
+            if child is original and child.height == height and not self.persistent:
+                # Поддерево не изменилось ни по форме, ни по высоте - выше всё
+                # сбалансировано, остаётся только пересчитать размеры
+                self._update_sizes(path[:index + 1])
+                return
+        self.root = child
 
-        return node
+    def _update_sizes(self, path: List[Tuple[AVLNode, bool]]) -> None:
+        for index in range(len(path) - 1, -1, -1):
+            node = path[index][0]
+            node.size = self._size(node.left) + len(node.students) + self._size(node.right)
 
     def insert(self, student: Student) -> None:
-        self.root = self._insert(self.root, student)
+        self._fresh.clear()
+        path: List[Tuple[AVLNode, bool]] = []
+        node = self.root
+        grade = student.average_grade
+        while node:
+            if grade == node.grade:
+                # Оценка уже есть - студент попадает в корзину, форма дерева не меняется
+                node = self._own(node)
+                if self.persistent:
+                    node.students = PersistentBucket.of(node.students).appended(student)
+                else:
+                    node.students.append(student)
+                node.size += 1
+                self._fix_path(path, node)
+                return
+            went_left = grade < node.grade
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        self._fix_path(path, AVLNode(student))
+
+    def _find_path(self, average_grade: float) -> Tuple[List[Tuple[AVLNode, bool]], Optional[AVLNode]]:
+        path: List[Tuple[AVLNode, bool]] = []
+        node = self.root
+        while node and node.grade != average_grade:
+            went_left = average_grade < node.grade
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        return path, node
 
     def _find_min(self, node: AVLNode) -> AVLNode:
-        if node.left is None:
-            return node
-        return self._find_min(node.left)
+        while node.left is not None:
+            node = node.left
+        return node
 
-    def _delete(self, node: Optional[AVLNode], average_grade: float) -> Optional[AVLNode]:
-        if not node:
-            return node
+    def delete(self, average_grade: float, full_name: Optional[str] = None) -> Optional[Student]:
+        # Удаляет одного студента с данной оценкой (с данным ФИО, если оно задано)
+        # и возвращает его; узел удаляется, когда его корзина пустеет
+        self._fresh.clear()
+        path, node = self._find_path(average_grade)
+        if node is None:
+            return None
+        if full_name is None:
+            index = len(node.students) - 1
+        else:
+            for index, student in enumerate(node.students):
+                if student.full_name == full_name:
+                    break
+            else:
+                return None
+        return self._delete_at(path, node, index)
 
-        if average_grade < node.student.average_grade:
-            node.left = self._delete(node.left, average_grade)
-        elif average_grade > node.student.average_grade:
-            node.right = self._delete(node.right, average_grade)
+    def remove(self, student: Student) -> bool:
+        # Удаляет именно этот объект студента (сравнение по ссылке)
+        self._fresh.clear()
+        path, node = self._find_path(student.average_grade)
+        if node is None:
+            return False
+        for index, candidate in enumerate(node.students):
+            if candidate is student:
+                self._delete_at(path, node, index)
+                return True
+        return False
+
+    def _delete_at(self, path: List[Tuple[AVLNode, bool]], node: AVLNode, index: int) -> Student:
+        node = self._own(node)
+        student = node.students[index]
+        if self.persistent:
+            node.students = PersistentBucket.of(node.students).without(index)
         else:
-            if not node.left:
-                return node.right
-            elif not node.right:
-                return node.left
-            temp = self._find_min(node.right)
-            node.student = temp.student
-            node.right = self._delete(node.right, temp.student.average_grade)
+            del node.students[index]
+        if node.students:
+            node.size -= 1
+            self._fix_path(path, node)
+        else:
+            self._remove_node(path, node)
+        return student
 
-        node.height = 1 + max(self._height(node.left), self._height(node.right))
-        balance = self._balance_factor(node)
+    def pop_all(self, average_grade: float) -> List[Student]:
+        # Удаляет всех студентов с данной оценкой одним удалением узла
+        self._fresh.clear()
+        path, node = self._find_path(average_grade)
+        if node is None:
+            return []
+        students = list(node.students)
+        self._remove_node(path, node)
+        return students
 
-        if balance > 1 and self._balance_factor(node.left) >= 0:
-            return self._rotate_right(node)
+    def count(self, average_grade: float) -> int:
+        _, node = self._find_path(average_grade)
+        return len(node.students) if node else 0
 
-        if balance < -1 and self._balance_factor(node.right) <= 0:
-            return self._rotate_left(node)
+    def _remove_node(self, path: List[Tuple[AVLNode, bool]], node: AVLNode) -> None:
+        if node.left is None or node.right is None:
+            self._fix_path(path, node.left or node.right)
+            return
 
-        if balance > 1 and self._balance_factor(node.left) < 0:
-            node.left = self._rotate_left(node.left)
-            return self._rotate_right(node)
+        # Два потомка: на место узла ставим преемника (минимум правого поддерева)
+        # и вырезаем именно этот узел, продолжая путь до него
+        node = self._own(node)
+        path.append((node, False))
+        successor = node.right
+        while successor.left is not None:
+            path.append((successor, True))
+            successor = successor.left
+        # Узел получает оценку и корзину преемника; старая корзина остаётся у вызывающего
+        node.grade = successor.grade
+        node.students = successor.students
+        self._fix_path(path, successor.right)
 
-        if balance < -1 and self._balance_factor(node.right) > 0:
-            node.right = self._rotate_right(node.right)
-            return self._rotate_left(node)
+    def rank(self, average_grade: float) -> int:
+        # Число студентов со средней оценкой строго меньше заданной
+        rank = 0
+        node = self.root
+        while node:
+            if average_grade <= node.grade:
+                if average_grade == node.grade:
+                    return rank + self._size(node.left)
+                node = node.left
+            else:
+                rank += self._size(node.left) + len(node.students)
+                node = node.right
+        return rank
+
+    def _count_not_greater(self, average_grade: float) -> int:
+        count = 0
+        node = self.root
+        while node:
+            if average_grade < node.grade:
+                node = node.left
+            else:
+                count += self._size(node.left) + len(node.students)
+                node = node.right
+        return count
+
+    def select(self, index: int) -> Student:
+        # Студент с номером index (с нуля) в порядке возрастания оценки
+        if not 0 <= index < self.size:
+            raise IndexError("Номер студента вне диапазона")
+        node = self.root
+        while node:
+            left_size = self._size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index < left_size + len(node.students):
+                return node.students[index - left_size]
+            else:
+                index -= left_size + len(node.students)
+                node = node.right
+        raise IndexError("Номер студента вне диапазона")
+
+    def count_range(self, lo: float, hi: float) -> int:
+        # Число студентов с оценкой в отрезке [lo, hi]
+        if lo > hi:
+            return 0
+        return self._count_not_greater(hi) - self.rank(lo)
+
+    def percentile(self, p: float) -> Student:
+        # Процентиль p (от 0 до 100) по методу ближайшего ранга
+        if not 0 <= p <= 100:
+            raise ValueError("Процентиль должен быть в диапазоне от 0 до 100")
+        if self.size == 0:
+            raise IndexError("Дерево пусто")
+        return self.select(max(math.ceil(p / 100 * self.size), 1) - 1)
 
+    def iter_range(self, lo: float, hi: float) -> Iterator[Student]:
+        # Ленивый симметричный обход студентов с оценкой в [lo, hi]: спускаемся
+        # сразу к lo и держим в стеке только узлы текущего пути (O(высоты) памяти)
+        stack: List[AVLNode] = []
+        node = self.root
+        while stack or node:
+            while node:
+                if node.grade < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.grade > hi:
+                return
+            yield from node.students
+            node = node.right
+
+    def delete_range(self, lo: float, hi: float) -> int:
+        # Удаляет всех студентов с оценкой в [lo, hi] двумя разрезами и одной
+        # склейкой дерева за O(log n); возвращает число удалённых студентов
+        if lo > hi:
+            return 0
+        self._fresh.clear()
+        left, rest = self._split(self.root, lo, False)
+        middle, right = self._split(rest, hi, True)
+        self.root = self._join2(left, right)
+        return self._size(middle)
+
+    def _split(self, node: Optional[AVLNode], grade: float,
+               equal_left: bool) -> Tuple[Optional[AVLNode], Optional[AVLNode]]:
+        # Разрезает дерево на оценки меньше grade и остальные; при equal_left
+        # узел с оценкой grade уходит в левую часть
+        if node is None:
+            return None, None
+        left, right = node.left, node.right
+        if grade < node.grade or (grade == node.grade and not equal_left):
+            split_left, split_right = self._split(left, grade, equal_left)
+            return split_left, self._join(split_right, node, right)
+        split_left, split_right = self._split(right, grade, equal_left)
+        return self._join(left, node, split_left), split_right
+
+    def _join(self, left: Optional[AVLNode], middle: AVLNode, right: Optional[AVLNode]) -> AVLNode:
+        # Склеивает деревья left < middle < right: middle подвешивается на той
+        # глубине более высокого дерева, где высоты отличаются не больше чем на 1
+        left_height, right_height = self._height(left), self._height(right)
+        if left_height > right_height + 1:
+            left = self._own(left)
+            left.right = self._join(left.right, middle, right)
+            return self._rebalance(left)
+        if right_height > left_height + 1:
+            right = self._own(right)
+            right.left = self._join(left, middle, right.left)
+            return self._rebalance(right)
+        middle = self._own(middle)
+        middle.left = left
+        middle.right = right
+        self._update(middle)
+        return middle
+
+    def _join2(self, left: Optional[AVLNode], right: Optional[AVLNode]) -> Optional[AVLNode]:
+        # Склейка без среднего узла: им становится минимум правого дерева
+        if left is None:
+            return right
+        if right is None:
+            return left
+        right, middle = self._pop_min(right)
+        return self._join(left, middle, right)
+
+    def _pop_min(self, node: AVLNode) -> Tuple[Optional[AVLNode], AVLNode]:
+        path: List[Tuple[AVLNode, bool]] = []
+        while node.left is not None:
+            path.append((node, True))
+            node = node.left
+        # Путь перестраивается в отдельном дереве, поэтому корень берём из стека пути
+        child = node.right
+        for parent, _ in reversed(path):
+            parent = self._own(parent)
+            parent.left = child
+            child = self._rebalance(parent)
+        return child, node
+
+    @classmethod
+    def from_sorted(cls, students: Iterable[Student]) -> 'AVLTree':
+        # Строит идеально сбалансированное дерево из студентов, упорядоченных по
+        # неубыванию оценки, за O(n) и без единого поворота
+        nodes: List[AVLNode] = []
+        for student in students:
+            if nodes and student.average_grade == nodes[-1].grade:
+                nodes[-1].students.append(student)
+            elif nodes and student.average_grade < nodes[-1].grade:
+                raise ValueError("Студенты не упорядочены по средней оценке")
+            else:
+                nodes.append(AVLNode(student))
+        tree = cls()
+        tree.root = tree._build_balanced(nodes, 0, len(nodes))
+        return tree
+
+    def _build_balanced(self, nodes: List[AVLNode], lo: int, hi: int) -> Optional[AVLNode]:
+        # Середина отрезка становится корнем; глубина рекурсии - O(log n)
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.left = self._build_balanced(nodes, lo, mid)
+        node.right = self._build_balanced(nodes, mid + 1, hi)
+        self._update(node)
         return node
 
-    def delete(self, average_grade: float) -> None:
-        self.root = self._delete(self.root, average_grade)
+    def save_to_file(self, filename: str, order: str = 'preorder') -> None:
+        # order='inorder' сохраняет студентов по возрастанию оценки, такой файл
+        # загружается обратно за O(n) через from_sorted
+        if order == 'preorder':
+            nodes = self._iter_preorder()
+        elif order == 'inorder':
+            nodes = self._iter_inorder()
+        else:
+            raise ValueError(f"Неизвестный порядок сохранения: {order}")
+        with open(filename, 'w', encoding='utf-8') as f:
+            for node in nodes:
+                for student in node.students:
+                    f.write(f"{student.full_name},{student.group_number},{student.course},"
+                            f"{student.age},{student.average_grade}\n")
 
-    def save_to_file(self, filename: str) -> None:
-        with open(filename, 'w') as f:
-            self._save_recursive(self.root, f)
+    def _iter_preorder(self) -> Iterator[AVLNode]:
+        # Прямой обход (корень, левое, правое) на явном стеке
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
 
-    def _save_recursive(self, node: Optional[AVLNode], file) -> None:
-        if node:
-            file.write(f"{node.student.full_name},{node.student.group_number},{node.student.course},"
-                       f"{node.student.age},{node.student.average_grade}\n")
-            self._save_recursive(node.left, file)
-            self._save_recursive(node.right, file)
+    def _iter_inorder(self) -> Iterator[AVLNode]:
+        stack: List[AVLNode] = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
 
     def load_from_file(self, filename: str) -> None:
-        with open(filename, 'r') as f:
+        students = []
+        with open(filename, 'r', encoding='utf-8') as f:
             for line in f:
                 full_name, group_number, course, age, average_grade = line.strip().split(',')
-                student = Student(full_name, group_number, int(course), int(age), float(average_grade))
+                students.append(Student(full_name, group_number, int(course), int(age), float(average_grade)))
+        # Файл, сохранённый по возрастанию оценки, в пустое дерево грузится без вставок
+        if self.root is None and all(students[i].average_grade <= students[i + 1].average_grade
+                                     for i in range(len(students) - 1)):
+            self.root = self.from_sorted(students).root
+            return
+        for student in students:
+            self.insert(student)
+
+    def save_binary(self, filename: str) -> None:
+        # Студенты пишутся по возрастанию оценки, чтобы загрузка шла через from_sorted
+        write_roster(filename, (student for node in self._iter_inorder() for student in node.students))
+
+    def load_binary(self, filename: str) -> None:
+        with RosterFile(filename, Student) as roster:
+            if self.root is None and roster.is_sorted():
+                self.root = self.from_sorted(roster).root
+                return
+            for student in roster:
                 self.insert(student)
 
     def search(self, average_grade: float) -> bool:
         return self._search(self.root, average_grade)
 
     def _search(self, node: Optional[AVLNode], average_grade: float) -> bool:
-        if not node:
-            return False
-        if node.student.average_grade == average_grade:
-            return True
-        elif average_grade < node.student.average_grade:
-            return self._search(node.left, average_grade)
-        else:
-            return self._search(node.right, average_grade)
+        while node:
+            if node.grade == average_grade:
+                return True
+            node = node.left if average_grade < node.grade else node.right
+        return False
 
     def search_via_inorder(self, average_grade: float) -> bool:
         return self._search_via_inorder(self.root, average_grade)
 
     def _search_via_inorder(self, node: Optional[AVLNode], average_grade: float) -> bool:
-        if node:
-            found = self._search_via_inorder(node.left, average_grade)
-            if found:
-                return True
-            if node.student.average_grade == average_grade:
+        # Симметричный обход на явном стеке
+        stack: List[AVLNode] = []
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            if node.grade == average_grade:
                 return True
-            return self._search_via_inorder(node.right, average_grade)
+            node = node.right
         return False
 
-def benchmark() -> None:
+class _RecursiveNode:
+    __slots__ = ('student', 'left', 'right', 'height')
+
+    def __init__(self, student: Student) -> None:
+        self.student = student
+        self.left: Optional[_RecursiveNode] = None
+        self.right: Optional[_RecursiveNode] = None
+        self.height: int = 1
+
+class _RecursiveAVLTree:
+    # Прежние рекурсивные insert/delete/search (узел на каждого студента) - только
+    # как база для сравнения в benchmark()
+    def __init__(self) -> None:
+        self.root: Optional[_RecursiveNode] = None
+
+    def _height(self, node: Optional[_RecursiveNode]) -> int:
+        return node.height if node else 0
+
+    def _balance_factor(self, node: _RecursiveNode) -> int:
+        return self._height(node.left) - self._height(node.right)
+
+    def _rotate_right(self, y: _RecursiveNode) -> _RecursiveNode:
+        x = y.left
+        y.left = x.right
+        x.right = y
+        y.height = 1 + max(self._height(y.left), self._height(y.right))
+        x.height = 1 + max(self._height(x.left), self._height(x.right))
+        return x
+
+    def _rotate_left(self, x: _RecursiveNode) -> _RecursiveNode:
+        y = x.right
+        x.right = y.left
+        y.left = x
+        x.height = 1 + max(self._height(x.left), self._height(x.right))
+        y.height = 1 + max(self._height(y.left), self._height(y.right))
+        return y
+
+    def _balance(self, node: _RecursiveNode) -> _RecursiveNode:
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        balance = self._balance_factor(node)
+        if balance > 1:
+            if self._balance_factor(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._balance_factor(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _insert(self, node: Optional[_RecursiveNode], student: Student) -> _RecursiveNode:
+        if not node:
+            return _RecursiveNode(student)
+        if student.average_grade < node.student.average_grade:
+            node.left = self._insert(node.left, student)
+        else:
+            node.right = self._insert(node.right, student)
+        return self._balance(node)
+
+    def insert(self, student: Student) -> None:
+        self.root = self._insert(self.root, student)
+
+    def _delete(self, node: Optional[_RecursiveNode], average_grade: float) -> Optional[_RecursiveNode]:
+        if not node:
+            return node
+        if average_grade < node.student.average_grade:
+            node.left = self._delete(node.left, average_grade)
+        elif average_grade > node.student.average_grade:
+            node.right = self._delete(node.right, average_grade)
+        else:
+            if not node.left:
+                return node.right
+            if not node.right:
+                return node.left
+            successor = node.right
+            while successor.left:
+                successor = successor.left
+            node.student = successor.student
+            node.right = self._delete(node.right, successor.student.average_grade)
+        return self._balance(node)
+
+    def delete(self, average_grade: float) -> None:
+        self.root = self._delete(self.root, average_grade)
+
+    def _search(self, node: Optional[_RecursiveNode], average_grade: float) -> bool:
+        if not node:
+            return False
+        if node.student.average_grade == average_grade:
+            return True
+        if average_grade < node.student.average_grade:
+            return self._search(node.left, average_grade)
+        return self._search(node.right, average_grade)
+
+    def search(self, average_grade: float) -> bool:
+        return self._search(self.root, average_grade)
+
+def benchmark(sizes: Tuple[int, ...] = (10 ** 3, 10 ** 5, 10 ** 6)) -> None:
+    # Итеративное дерево против прежнего рекурсивного на одних и тех же данных
+    for n in sizes:
+        grades = [((i * 7919) % n) / 100 for i in range(n)]
+        students = [Student(f"Student {i}", str(i), 1, 18, grade) for i, grade in enumerate(grades)]
+        elapsed = {}
+        for name, q in (("recursive", _RecursiveAVLTree()), ("iterative", AVLTree())):
+            # Вставка n студентов
+            start_time = time.time()
+            for student in students:
+                q.insert(student)
+            elapsed[name, 'push'] = time.time() - start_time
+
+            # Поиск n оценок
+            start_time = time.time()
+            for grade in grades:
+                q.search(grade)
+            elapsed[name, 'search'] = time.time() - start_time
+
+            # Удаление n студентов
+            start_time = time.time()
+            for grade in grades:
+                q.delete(grade)  # Удаляем студентов с этими средними оценками
+            elapsed[name, 'delete'] = time.time() - start_time
+
+        for operation in ('push', 'search', 'delete'):
+            recursive, iterative = elapsed['recursive', operation], elapsed['iterative', operation]
+            print(f"Time to {operation} {n} students: {iterative:.6f} seconds ({iterative / n * 1e6:.3f} us/op), "
+                  f"recursive {recursive:.6f} seconds, speedup {recursive / iterative:.2f}x")
+
+def benchmark_duplicates(n: int = 10 ** 5, distinct: int = 10) -> None:
+    # Как в исходном бенчмарке: много студентов и всего несколько различных оценок.
+    # В режиме persistent корзины делятся между версиями кусками (PersistentBucket)
+    students = [Student(f"Student {i}", str(i), 1, 18, 4.0 + (i % distinct) * 0.1) for i in range(n)]
+    for persistent in (False, True):
+        mode = 'persistent' if persistent else 'plain'
+        q = AVLTree(persistent=persistent)
+        start_time = time.time()
+        for student in students:
+            q.insert(student)
+        print(f"{mode}: time to push {n} students with {distinct} distinct grades: "
+              f"{time.time() - start_time:.6f} seconds")
+
+        start_time = time.time()
+        for i in range(n):
+            q.delete(4.0 + (i % distinct) * 0.1)
+        print(f"{mode}: time to delete {n} students with {distinct} distinct grades: "
+              f"{time.time() - start_time:.6f} seconds")
+
+def benchmark_range(n: int = 10 ** 5) -> None:
+    grades = [((i * 7919) % n) / 100 for i in range(n)]
+    students = [Student(f"Student {i}", str(i), 1, 18, grade) for i, grade in enumerate(grades)]
+    lo, hi = n / 400, n / 200  # четверть всех оценок
+
     q = AVLTree()
+    for student in students:
+        q.insert(student)
     start_time = time.time()
+    band = sum(1 for _ in q.iter_range(lo, hi))
+    print(f"Time to iterate {band} of {n} students in range: {time.time() - start_time:.6f} seconds")
+    start_time = time.time()
+    for grade in grades:
+        if lo <= grade <= hi:
+            q.delete(grade)
+    print(f"Time to delete {band} students one by one: {time.time() - start_time:.6f} seconds")
 
-    # Вставка 1000 студентов
-    for i in range(1000):
-        q.insert(Student(f"Student {i}", str(i), 1, 18, 4.0 + (i % 10) * 0.1))
-    print(f"Time to push 1000 students: {time.time() - start_time:.6f} seconds")
-
-    # Удаление 1000 студентов
+    q = AVLTree()
+    for student in students:
+        q.insert(student)
     start_time = time.time()
-    for i in range(1000):
-        q.delete(4.0 + (i % 10) * 0.1)  # Удаляем студентов с этими средними оценками
-    print(f"Time to delete 1000 students: {time.time() - start_time:.6f} seconds")
+    q.delete_range(lo, hi)
+    print(f"Time to delete {band} students with delete_range: {time.time() - start_time:.6f} seconds")
+
+def benchmark_restart(n: int = 10 ** 6) -> None:
+    # Время перезапуска: загрузка сохранённого дерева из файла
+    q = AVLTree.from_sorted(Student(f"Student {i}", f"Group {i % 100}", (i % 4) + 1, 18 + (i % 5), i / 1000)
+                            for i in range(n))
+    for order in ('preorder', 'inorder'):
+        q.save_to_file('benchmark_students.txt', order=order)
+        start_time = time.time()
+        AVLTree().load_from_file('benchmark_students.txt')
+        print(f"Time to load {n} students saved in {order}: {time.time() - start_time:.6f} seconds")
+    os.remove('benchmark_students.txt')
+
+def benchmark_memory(n: int = 10 ** 5) -> None:
+    # Байты на студента (tracemalloc) для дерева с уникальными и с повторяющимися оценками
+    for distinct in (n, 10):
+        tracemalloc.start()
+        students = [Student(f"Student {i}", f"Group {i % 100}", (i % 4) + 1, 18 + (i % 5), (i % distinct) / 100)
+                    for i in range(n)]
+        students_bytes = tracemalloc.get_traced_memory()[0]
+        q = AVLTree()
+        for student in students:
+            q.insert(student)
+        total_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{distinct} distinct grades: students {students_bytes / n:.1f} bytes each, "
+              f"tree overhead {(total_bytes - students_bytes) / n:.1f} bytes per student")
+
+def benchmark_snapshots(n: int = 10 ** 5, readers: int = 2, duration: float = 2.0) -> None:
+    # Читатели целиком обходят дерево (как генератор отчётов), пока писатель
+    # вставляет и удаляет студентов: снимки против общей блокировки
+    students = [Student(f"Student {i}", str(i), 1, 18, ((i * 7919) % n) / 100) for i in range(n)]
+    lo, hi = -math.inf, math.inf
+
+    for mode in ('lock', 'snapshot'):
+        q = AVLTree(persistent=mode == 'snapshot')
+        for student in students:
+            q.insert(student)
+        lock = threading.Lock()
+        stop = threading.Event()
+        reads = [0] * readers
+        writes = [0]
+
+        def write() -> None:
+            i = 0
+            while not stop.is_set():
+                student = students[i % n]
+                if mode == 'lock':
+                    with lock:
+                        q.delete(student.average_grade)
+                        q.insert(student)
+                else:
+                    q.delete(student.average_grade)
+                    q.insert(student)
+                writes[0] += 1
+                i += 1
+
+        def read(r: int) -> None:
+            while not stop.is_set():
+                if mode == 'lock':
+                    with lock:
+                        sum(1 for _ in q.iter_range(lo, hi))
+                else:
+                    sum(1 for _ in q.snapshot().iter_range(lo, hi))
+                reads[r] += 1
+
+        threads = [threading.Thread(target=write)] + [threading.Thread(target=read, args=(r,)) for r in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        print(f"{mode}: {sum(reads) / duration:.1f} full reads/s, {writes[0] / duration:.0f} writes/s "
+              f"({readers} readers, {n} students)")
 
 def run_tests() -> None:
     tree = AVLTree()
@@ -222,6 +866,182 @@ def run_tests() -> None:
     # Тест 5: Проверка на несуществующую оценку
     assert tree.search(10.0) == False  # Оценка 10.0 не должна существовать
 
+    # Тест 6: После смешанных вставок и удалений дерево сбалансировано и упорядочено
+    tree = AVLTree()
+    grades = [((i * 37) % 101) / 20 for i in range(2000)]
+    for i, grade in enumerate(grades):
+        tree.insert(Student(f"Student {i}", str(i), 1, 18, grade))
+    for grade in grades[::3]:
+        tree.delete(grade)
+        grades.remove(grade)
+    grades.sort()
+
+    def check(node: Optional[AVLNode]) -> int:
+        if node is None:
+            return 0
+        left_height, right_height = check(node.left), check(node.right)
+        assert abs(left_height - right_height) <= 1
+        assert node.height == 1 + max(left_height, right_height)
+        assert node.size == len(node.students) + (node.left.size if node.left else 0) + \
+            (node.right.size if node.right else 0)
+        return node.height
+
+    check(tree.root)
+    inorder = []
+    stack: List[AVLNode] = []
+    node = tree.root
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        inorder.extend(student.average_grade for student in node.students)
+        node = node.right
+    assert inorder == grades
+    assert all(tree.search(g) and tree.search_via_inorder(g) for g in grades)
+    assert tree.search(5.5) == False and tree.search_via_inorder(5.5) == False
+
+    # Тест 7: Корзины студентов с одинаковой оценкой
+    tree = AVLTree()
+    for i in range(100):
+        tree.insert(Student(f"Student {i}", str(i), 1, 18, 4.0 + (i % 10) * 0.1))
+    nodes = 0
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        nodes += 1
+        stack.extend(child for child in (node.left, node.right) if child)
+    assert nodes == 10
+    assert tree.count(4.0) == 10
+    assert tree.delete(4.0, full_name="Student 20").full_name == "Student 20"
+    assert tree.delete(4.0, full_name="Student 20") is None
+    assert tree.count(4.0) == 9
+    popped = tree.pop_all(4.0)
+    assert len(popped) == 9 and all(s.average_grade == 4.0 for s in popped)
+    assert tree.search(4.0) == False and tree.count(4.0) == 0 and tree.pop_all(4.0) == []
+    twin = Student("Student 1", "1", 1, 18, 4.1)
+    tree.insert(twin)
+    assert tree.remove(Student("Student 1", "1", 1, 18, 4.1)) == False
+    assert tree.remove(twin) == True and tree.remove(twin) == False
+    assert tree.count(4.0 + 9 * 0.1) == 10
+    for _ in range(10):
+        tree.delete(4.0 + 5 * 0.1)
+    assert tree.search(4.0 + 5 * 0.1) == False
+    check(tree.root)
+
+    # Тест 8: Ранг, выбор по номеру, подсчёт в диапазоне и процентили
+    tree = AVLTree()
+    grades = [((i * 37) % 101) / 20 for i in range(500)]
+    for i, grade in enumerate(grades):
+        tree.insert(Student(f"Student {i}", str(i), 1, 18, grade))
+    for grade in grades[::4]:
+        tree.delete(grade)
+        grades.remove(grade)
+    grades.sort()
+    check(tree.root)
+    assert len(tree) == len(grades)
+    assert [tree.select(i).average_grade for i in range(len(grades))] == grades
+    for probe in (0.0, 1.05, 2.5, 3.3, 5.0, 6.0, -1.0):
+        assert tree.rank(probe) == sum(1 for g in grades if g < probe)
+        assert tree.count_range(probe, probe + 1.2) == sum(1 for g in grades if probe <= g <= probe + 1.2)
+    assert tree.count_range(3.0, 2.0) == 0
+    assert tree.percentile(100).average_grade == grades[-1]
+    assert tree.percentile(0).average_grade == grades[0]
+    assert tree.percentile(90).average_grade == grades[math.ceil(0.9 * len(grades)) - 1]
+    try:
+        tree.select(len(grades))
+        assert False, "Ожидалась ошибка IndexError"
+    except IndexError:
+        pass
+
+    # Тест 9: Ленивый обход диапазона и удаление диапазона
+    assert [s.average_grade for s in tree.iter_range(1.0, 2.0)] == [g for g in grades if 1.0 <= g <= 2.0]
+    assert list(tree.iter_range(6.0, 7.0)) == [] and list(tree.iter_range(2.0, 1.0)) == []
+    assert [s.average_grade for s in tree.iter_range(-1.0, 10.0)] == grades
+    band = iter(tree.iter_range(0.0, 5.0))
+    assert next(band).average_grade == grades[0]
+    removed = tree.delete_range(1.0, 2.0)
+    assert removed == sum(1 for g in grades if 1.0 <= g <= 2.0)
+    grades = [g for g in grades if not 1.0 <= g <= 2.0]
+    check(tree.root)
+    assert [s.average_grade for s in tree.iter_range(-1.0, 10.0)] == grades
+    assert tree.delete_range(1.0, 2.0) == 0
+    assert tree.delete_range(grades[0], grades[0]) == grades.count(grades[0])
+    remaining = len(tree)
+    assert tree.delete_range(-1.0, 10.0) == remaining
+    assert len(tree) == 0 and tree.root is None
+
+    # Тест 10: Построение из упорядоченных данных и сохранение по возрастанию
+    students = sorted((Student(f"Student {i}", str(i), 1, 18, ((i * 37) % 101) / 20) for i in range(300)),
+                      key=lambda s: s.average_grade)
+    tree = AVLTree.from_sorted(students)
+    check(tree.root)
+    assert len(tree) == 300
+    assert [s.full_name for s in tree.iter_range(-1.0, 10.0)] == [s.full_name for s in students]
+    try:
+        AVLTree.from_sorted(reversed(students))
+        assert False, "Ожидалась ошибка ValueError"
+    except ValueError:
+        pass
+    tree.save_to_file('test_students_sorted.txt', order='inorder')
+    loaded = AVLTree()
+    loaded.load_from_file('test_students_sorted.txt')
+    check(loaded.root)
+    assert [s.full_name for s in loaded.iter_range(-1.0, 10.0)] == [s.full_name for s in students]
+    tree.save_to_file('test_students_sorted.txt')
+    loaded = AVLTree()
+    loaded.load_from_file('test_students_sorted.txt')
+    check(loaded.root)
+    assert [s.average_grade for s in loaded.iter_range(-1.0, 10.0)] == [s.average_grade for s in students]
+    os.remove('test_students_sorted.txt')
+
+    # Тест 11: Снимки дерева в режиме persistent не видят последующих изменений
+    tree = AVLTree(persistent=True)
+    for i in range(200):
+        tree.insert(Student(f"Student {i}", str(i), 1, 18, (i % 40) / 10))
+    before = tree.snapshot()
+    expected = [(s.full_name, s.average_grade) for s in before.iter_range(-1.0, 10.0)]
+    for i in range(0, 200, 3):
+        tree.delete((i % 40) / 10)
+    tree.pop_all(1.5)
+    tree.delete_range(2.0, 2.5)
+    tree.insert(Student("Новый Студент", "1", 1, 18, 1.55))
+    check(tree.root)
+    check(before.root)
+    assert [(s.full_name, s.average_grade) for s in before.iter_range(-1.0, 10.0)] == expected
+    assert len(before) == 200 and before.count(1.5) == 5
+    assert tree.count(1.5) == 0 and tree.search(1.55) == True and before.search(1.55) == False
+    # Запись в снимок тоже не затрагивает исходное дерево
+    before.delete_range(0.0, 10.0)
+    assert len(before) == 0 and tree.search(1.55) == True
+    # Большие корзины (несколько кусков) тоже не меняются в снимке
+    tree = AVLTree(persistent=True)
+    for i in range(1000):
+        tree.insert(Student(f"Student {i}", str(i), 1, 18, (i % 3) / 10))
+    before = tree.snapshot()
+    expected = [s.full_name for s in before.iter_range(-1.0, 10.0)]
+    for i in range(0, 1000, 7):
+        assert tree.delete((i % 3) / 10, f"Student {i}").full_name == f"Student {i}"
+    for i in range(1000, 1100):
+        tree.insert(Student(f"Student {i}", str(i), 1, 18, 0.1))
+    check(tree.root)
+    assert [s.full_name for s in before.iter_range(-1.0, 10.0)] == expected
+    assert tree.count(0.1) == 333 - len(range(7, 1000, 21)) + 100
+    names = [s.full_name for s in tree.iter_range(0.1, 0.1)]
+    assert names[-1] == "Student 1099" and tree.select(tree.count(0.0) + tree.count(0.1) - 1).full_name == "Student 1099"
+    zeros = tree.count(0.0)
+    assert len(tree.pop_all(0.0)) == zeros and tree.count(0.0) == 0 and before.count(0.0) == 334
+    try:
+        AVLTree().snapshot()
+        assert False, "Ожидалась ошибка ValueError"
+    except ValueError:
+        pass
+
 if __name__ == "__main__":
     benchmark()
+    benchmark_duplicates()
+    benchmark_range()
+    benchmark_restart()
+    benchmark_memory()
+    benchmark_snapshots()
     run_tests()
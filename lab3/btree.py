@@ -0,0 +1,677 @@
+import math
+import os
+import struct
+import time
+import tracemalloc
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from kucha import Student
+
+# Файл B+-дерева, версия 2, состоит из страниц одинакового размера (все числа
+# little-endian, строки в UTF-8). Каждая страница начинается с длины данных (uint32).
+# Страница 0 - служебная: магия b'STBT', версия (uint16), число полей ключа (uint16),
+# размер страницы, корень, число страниц (uint32), число студентов (uint64), голова
+# списка свободных страниц (uint32) и номера полей ключа в FIELDS (по байту).
+# Остальные страницы: вид (uint8), следующая страница (uint32), число элементов n
+# (uint32) и следом
+#   лист - n записей студентов по столбцам: курсы и возрасты (int32[n]), средние
+#          оценки (float64[n]), затем n ФИО и n номеров групп, каждая строка
+#          заканчивается нулевым байтом; ключи не хранятся (вычисляются из записей
+#          при чтении), следующая страница - следующий лист;
+#   внутренний узел - n + 1 номеров дочерних страниц (uint32) и n ключей-разделителей:
+#          поля ключа подряд, строка - длина (uint16) и байты, курс и возраст -
+#          int32, оценка - float64;
+#   свободная страница - n = 0, следующая страница - следующая свободная
+MAGIC = b'STBT'
+VERSION = 2
+LENGTH = struct.Struct('<I')
+META = struct.Struct('<4sHHIIIQI')
+PAGE_HEADER = struct.Struct('<BII')
+STRING_LENGTH = struct.Struct('<H')
+INT = struct.Struct('<i')
+FLOAT = struct.Struct('<d')
+FREE, LEAF, INTERNAL = 0, 1, 2
+# Поля записи студента в том порядке, в каком их принимает конструктор Student
+FIELDS = ('full_name', 'group_number', 'course', 'age', 'average_grade')
+TEXT_FIELDS = ('full_name', 'group_number')
+
+Key = Tuple[Any, ...]
+Record = Tuple[str, str, int, int, float]
+
+class _Top:
+    # Больше любого значения: (p..., TOP) - верхняя граница всех ключей с префиксом p
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        return other is self
+
+    def __lt__(self, other: object) -> bool:
+        return False
+
+    def __gt__(self, other: object) -> bool:
+        return other is not self
+
+    __hash__ = object.__hash__
+
+TOP = _Top()
+
+def _encode_records(records: List[Record]) -> bytes:
+    # Столбцы упаковываются целиком, без цикла по записям
+    if not records:
+        return b''
+    names, groups, courses, ages, grades = zip(*records)
+    count = len(records)
+    return (struct.pack(f'<{count}i{count}i{count}d', *courses, *ages, *grades) +
+            ('\0'.join(names + groups) + '\0').encode('utf-8'))
+
+def _record_size(record: Record) -> int:
+    # Записи занимают место независимо друг от друга, поэтому размер листа - сумма
+    # размеров записей: два int32, float64 и две строки с нулевым байтом
+    return 18 + len(record[0].encode('utf-8')) + len(record[1].encode('utf-8'))
+
+def _decode_columns(data: bytes, offset: int, count: int) -> Tuple[Sequence[Any], ...]:
+    # Столбцы записей в порядке FIELDS
+    numbers = struct.unpack_from(f'<{count}i{count}i{count}d', data, offset)
+    strings = str(data[offset + 16 * count:], 'utf-8').split('\0')
+    if len(strings) != 2 * count + 1 or strings[-1]:
+        raise ValueError("Неверные строки листа")
+    return strings[:count], strings[count:-1], numbers[:count], numbers[count:2 * count], numbers[2 * count:]
+
+class BTreePage:
+    __slots__ = ('page_id', 'leaf', 'keys', 'values', 'next', 'dirty', 'nbytes')
+
+    def __init__(self, page_id: int, leaf: bool, keys: List[Key], values: list, next_page: int = 0) -> None:
+        self.page_id = page_id
+        self.leaf = leaf
+        self.keys = keys
+        # В листе - записи студентов, во внутреннем узле - номера дочерних страниц
+        self.values = values
+        # Следующий лист в порядке ключей (0 - нет)
+        self.next = next_page
+        self.dirty = False
+        # Размер закодированной страницы (None - неизвестен)
+        self.nbytes: Optional[int] = None
+
+class BPlusTree:
+    # B+-дерево студентов в одном файле. В памяти держится не больше cache_pages
+    # страниц (LRU-кеш с отложенной записью), поэтому размер списка ограничен
+    # диском, а не оперативной памятью. Ключ по умолчанию - средняя оценка, как
+    # у AVLTree; key_fields задаёт составной ключ, например ('group_number',
+    # 'average_grade'). Запросы принимают ключ или его префикс (скаляр = префикс
+    # из одного поля). Студенты с равным ключом идут в порядке вставки.
+    # Изменения попадают в файл при вытеснении страниц, flush() и close()
+    def __init__(self, filename: str, key_fields: Optional[Sequence[str]] = None,
+                 page_size: int = 4096, cache_pages: int = 256) -> None:
+        if cache_pages < 4:
+            raise ValueError("Кеш должен вмещать хотя бы 4 страницы")
+        if key_fields is not None:
+            key_fields = tuple(key_fields)
+            if not key_fields or any(field not in FIELDS for field in key_fields):
+                raise ValueError(f"Поля ключа должны быть из {FIELDS}")
+        self.filename = filename
+        self.cache_pages = cache_pages
+        self.cache: 'OrderedDict[int, BTreePage]' = OrderedDict()
+        # Счётчики для оценки работы кеша
+        self.hits = 0
+        self.reads = 0
+        self.writes = 0
+
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            self.file = open(filename, 'r+b')
+            try:
+                self._read_meta(key_fields)
+            except Exception:
+                self.file.close()
+                raise
+        else:
+            if page_size < 256:
+                raise ValueError("Размер страницы должен быть не меньше 256 байт")
+            self.file = open(filename, 'w+b')
+            self.page_size = page_size
+            self.key_fields = key_fields or ('average_grade',)
+            self.page_count = 1
+            self.size = 0
+            self.free_head = 0
+            self.root = self._allocate(True).page_id
+            self.flush()
+
+        self._key_columns = tuple(FIELDS.index(field) for field in self.key_fields)
+        getter = itemgetter(*self._key_columns)
+        self._key = (lambda record: (getter(record),)) if len(self.key_fields) == 1 else getter
+
+    def _read_meta(self, key_fields: Optional[Tuple[str, ...]]) -> None:
+        self.file.seek(0)
+        data = self.file.read(LENGTH.size + META.size + len(FIELDS))
+        if len(data) < LENGTH.size + META.size or data[LENGTH.size:LENGTH.size + len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.filename} не является файлом B+-дерева")
+        magic, version, field_count, self.page_size, self.root, self.page_count, self.size, self.free_head = \
+            META.unpack_from(data, LENGTH.size)
+        if version != VERSION:
+            raise ValueError(f"Неподдерживаемая версия формата: {version}")
+        field_ids = data[LENGTH.size + META.size:LENGTH.size + META.size + field_count]
+        if not 0 < field_count == len(field_ids) or any(i >= len(FIELDS) for i in field_ids) or \
+                self.page_size < 256 or os.path.getsize(self.filename) < self.page_count * self.page_size:
+            raise ValueError(f"Файл {self.filename} повреждён: неверная служебная страница")
+        stored_fields = tuple(FIELDS[i] for i in field_ids)
+        if key_fields is not None and key_fields != stored_fields:
+            raise ValueError(f"Файл построен по ключу {stored_fields}, а не {key_fields}")
+        self.key_fields = stored_fields
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __enter__(self) -> 'BPlusTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def flush(self) -> None:
+        for page in self.cache.values():
+            if page.dirty:
+                self._write(page)
+        meta = META.pack(MAGIC, VERSION, len(self.key_fields), self.page_size, self.root,
+                         self.page_count, self.size, self.free_head)
+        self._write_raw(0, meta + bytes(FIELDS.index(field) for field in self.key_fields))
+        self.file.flush()
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+            self.cache.clear()
+
+    # --- Страницы и кеш ---
+
+    def _page(self, page_id: int) -> BTreePage:
+        page = self.cache.get(page_id)
+        if page is not None:
+            self.hits += 1
+            self.cache.move_to_end(page_id)
+            return page
+        self.reads += 1
+        kind, next_page, count, data = self._read_raw(page_id)
+        offset = LENGTH.size + PAGE_HEADER.size
+        try:
+            if kind == LEAF:
+                columns = _decode_columns(data, offset, count)
+                values = list(zip(*columns))
+                keys = list(zip(*(columns[i] for i in self._key_columns)))
+            elif kind == INTERNAL:
+                values = list(struct.unpack_from(f'<{count + 1}I', data, offset))
+                keys, offset = self._decode_keys(data, offset + 4 * (count + 1), count)
+                if offset != len(data):
+                    raise ValueError("Лишние байты в странице")
+            else:
+                raise ValueError("Неверный вид страницы")
+        except (struct.error, UnicodeDecodeError, ValueError):
+            raise self._corrupt(page_id) from None
+        page = BTreePage(page_id, kind == LEAF, keys, values, next_page)
+        page.nbytes = len(data)
+        self._cache(page)
+        return page
+
+    def _cache(self, page: BTreePage) -> None:
+        # Вытесняется давно не использованная страница; изменённая сначала пишется на диск
+        self.cache[page.page_id] = page
+        self.cache.move_to_end(page.page_id)
+        while len(self.cache) > self.cache_pages:
+            _, old = self.cache.popitem(last=False)
+            if old.dirty:
+                self._write(old)
+
+    def _dirty(self, page: BTreePage) -> None:
+        # Страница могла быть вытеснена, пока операция держала ссылку на неё,
+        # поэтому изменённая страница всегда возвращается в кеш
+        page.dirty = True
+        page.nbytes = None
+        self._cache(page)
+
+    def _encode(self, page: BTreePage) -> bytes:
+        if page.leaf:
+            return PAGE_HEADER.pack(LEAF, page.next, len(page.values)) + _encode_records(page.values)
+        return (PAGE_HEADER.pack(INTERNAL, 0, len(page.keys)) + struct.pack(f'<{len(page.values)}I', *page.values) +
+                b''.join(map(self._encode_key, page.keys)))
+
+    def _encode_key(self, key: Key) -> bytes:
+        parts = []
+        for field, value in zip(self.key_fields, key):
+            if field in TEXT_FIELDS:
+                value = value.encode('utf-8')
+                parts.append(STRING_LENGTH.pack(len(value)) + value)
+            else:
+                parts.append((FLOAT if field == 'average_grade' else INT).pack(value))
+        return b''.join(parts)
+
+    def _decode_keys(self, data: bytes, offset: int, count: int) -> Tuple[List[Key], int]:
+        keys: List[Key] = []
+        for _ in range(count):
+            key = []
+            for field in self.key_fields:
+                if field in TEXT_FIELDS:
+                    length, = STRING_LENGTH.unpack_from(data, offset)
+                    offset += STRING_LENGTH.size
+                    key.append(str(data[offset:offset + length], 'utf-8'))
+                    offset += length
+                else:
+                    number = FLOAT if field == 'average_grade' else INT
+                    key.append(number.unpack_from(data, offset)[0])
+                    offset += number.size
+            keys.append(tuple(key))
+        return keys, offset
+
+    def _corrupt(self, page_id: int) -> ValueError:
+        return ValueError(f"Файл {self.filename} повреждён: страница {page_id}")
+
+    def _write(self, page: BTreePage) -> None:
+        self._write_raw(page.page_id, self._encode(page))
+        page.dirty = False
+        self.writes += 1
+
+    def _write_raw(self, page_id: int, data: bytes) -> None:
+        # Проверка не через assert: при python -O страница молча затёрла бы следующую
+        if len(data) + LENGTH.size > self.page_size:
+            raise ValueError(f"Страница {page_id} не помещается в {self.page_size} байт")
+        self.file.seek(page_id * self.page_size)
+        self.file.write((LENGTH.pack(len(data)) + data).ljust(self.page_size, b'\0'))
+
+    def _read_raw(self, page_id: int) -> Tuple[int, int, int, bytes]:
+        # Вид, следующая страница, число элементов и данные страницы с длиной в начале
+        self.file.seek(page_id * self.page_size)
+        data = self.file.read(self.page_size)
+        if len(data) < LENGTH.size + PAGE_HEADER.size:
+            raise self._corrupt(page_id)
+        length, = LENGTH.unpack_from(data)
+        kind, next_page, count = PAGE_HEADER.unpack_from(data, LENGTH.size)
+        if not PAGE_HEADER.size <= length <= self.page_size - LENGTH.size or kind not in (FREE, LEAF, INTERNAL) or \
+                next_page >= self.page_count:
+            raise self._corrupt(page_id)
+        return kind, next_page, count, data[:LENGTH.size + length]
+
+    def _allocate(self, leaf: bool) -> BTreePage:
+        if self.free_head:
+            page_id = self.free_head
+            kind, self.free_head, _, _ = self._read_raw(page_id)
+            if kind != FREE:
+                raise self._corrupt(page_id)
+        else:
+            page_id = self.page_count
+            self.page_count += 1
+        page = BTreePage(page_id, leaf, [], [])
+        self._dirty(page)
+        return page
+
+    def _free(self, page: BTreePage) -> None:
+        self.cache.pop(page.page_id, None)
+        page.dirty = False
+        self._write_raw(page.page_id, PAGE_HEADER.pack(FREE, self.free_head, 0))
+        self.free_head = page.page_id
+
+    def _size(self, page: BTreePage) -> int:
+        if page.nbytes is None:
+            page.nbytes = len(self._encode(page)) + LENGTH.size
+        return page.nbytes
+
+    def _fits(self, page: BTreePage) -> bool:
+        return self._size(page) <= self.page_size
+
+    def _underfull(self, page: BTreePage) -> bool:
+        return self._size(page) < self.page_size // 4
+
+    # --- Вставка ---
+
+    def insert(self, student: Student) -> None:
+        record = (student.full_name, student.group_number, student.course, student.age, student.average_grade)
+        # Ограничение гарантирует, что после деления пополам обе половины поместятся в страницу
+        if '\0' in student.full_name or '\0' in student.group_number:
+            raise ValueError("ФИО и номер группы не могут содержать нулевой символ")
+        record_size = _record_size(record)
+        if record_size > self.page_size // 4:
+            raise ValueError("Запись студента не помещается в страницу")
+        key = self._key(record)
+        path: List[Tuple[BTreePage, int]] = []
+        page = self._page(self.root)
+        while not page.leaf:
+            index = bisect_right(page.keys, key)
+            path.append((page, index))
+            page = self._page(page.values[index])
+        index = bisect_right(page.keys, key)
+        size = self._size(page)
+        page.keys.insert(index, key)
+        page.values.insert(index, record)
+        self.size += 1
+        self._dirty(page)
+        # Размер листа растёт ровно на размер записи
+        page.nbytes = size + record_size
+
+        while not self._fits(page):
+            separator, right = self._split(page)
+            if not path:
+                root = self._allocate(False)
+                root.keys = [separator]
+                root.values = [page.page_id, right.page_id]
+                self.root = root.page_id
+                break
+            parent, index = path.pop()
+            parent.keys.insert(index, separator)
+            parent.values.insert(index + 1, right.page_id)
+            self._dirty(parent)
+            page = parent
+
+    def _split(self, page: BTreePage, right: Optional[BTreePage] = None) -> Tuple[Key, BTreePage]:
+        # Делим по байтам, а не по числу записей: ФИО бывают разной длины
+        if page.leaf:
+            sizes = list(map(_record_size, page.values))
+        else:
+            sizes = [len(self._encode_key(key)) + INT.size for key in page.keys]
+        half = sum(sizes) / 2
+        total = 0
+        for cut, size in enumerate(sizes, 1):
+            total += size
+            if total >= half:
+                break
+        if right is None:
+            right = self._allocate(page.leaf)
+        if page.leaf:
+            cut = min(max(cut, 1), len(sizes) - 1)
+            right.keys, page.keys = page.keys[cut:], page.keys[:cut]
+            right.values, page.values = page.values[cut:], page.values[:cut]
+            right.next, page.next = page.next, right.page_id
+            separator = right.keys[0]
+        else:
+            # Средний ключ уходит в родителя
+            cut = min(max(cut - 1, 1), len(sizes) - 2)
+            separator = page.keys[cut]
+            right.keys, page.keys = page.keys[cut + 1:], page.keys[:cut]
+            right.values, page.values = page.values[cut + 1:], page.values[:cut + 1]
+        self._dirty(page)
+        self._dirty(right)
+        return separator, right
+
+    # --- Удаление ---
+
+    def delete(self, key: Any, full_name: Optional[str] = None) -> Optional[Student]:
+        # Как AVLTree.delete: удаляет последнего вставленного студента с этим ключом
+        # (первого с данным ФИО, если оно задано) и возвращает его
+        lo = self._prefix(key)
+        found = self._find(self._page(self.root), lo, lo + (TOP,), full_name, [])
+        if found is None:
+            return None
+        path, leaf, index = found
+        del leaf.keys[index]
+        record = leaf.values.pop(index)
+        self.size -= 1
+        self._dirty(leaf)
+        self._rebalance(path, leaf)
+        return Student(*record)
+
+    def _find(self, page: BTreePage, lo: Key, upper: Key, full_name: Optional[str],
+              path: List[Tuple[BTreePage, int]]) -> Optional[Tuple[List[Tuple[BTreePage, int]], BTreePage, int]]:
+        # Равные ключи могут лежать в нескольких соседних поддеревьях,
+        # поэтому перебираем все дочерние страницы между разделителями lo и upper
+        first = bisect_left(page.keys, lo)
+        last = bisect_right(page.keys, upper)
+        if page.leaf:
+            if full_name is None:
+                return (path, page, last - 1) if first < last else None
+            for index in range(first, last):
+                if page.values[index][0] == full_name:
+                    return path, page, index
+            return None
+        children = range(first, last + 1)
+        for index in (reversed(children) if full_name is None else children):
+            found = self._find(self._page(page.values[index]), lo, upper, full_name, path + [(page, index)])
+            if found is not None:
+                return found
+        return None
+
+    def _rebalance(self, path: List[Tuple[BTreePage, int]], page: BTreePage) -> None:
+        # Недозаполненная страница сливается с соседней или делит с ней записи поровну
+        while path and self._underfull(page):
+            parent, index = path.pop()
+            if len(parent.values) > 1:
+                if index + 1 < len(parent.values):
+                    self._merge(parent, index, page, self._page(parent.values[index + 1]))
+                else:
+                    self._merge(parent, index - 1, self._page(parent.values[index - 1]), page)
+            page = parent
+        root = self._page(self.root)
+        while not root.leaf and len(root.values) == 1:
+            self.root = root.values[0]
+            self._free(root)
+            root = self._page(self.root)
+
+    def _merge(self, parent: BTreePage, separator: int, left: BTreePage, right: BTreePage) -> None:
+        if left.leaf:
+            left.keys = left.keys + right.keys
+            left.next = right.next
+        else:
+            left.keys = left.keys + [parent.keys[separator]] + right.keys
+        left.values = left.values + right.values
+        # Размер объединённой страницы нужно пересчитать
+        left.nbytes = None
+        if self._fits(left):
+            del parent.keys[separator]
+            del parent.values[separator + 1]
+            self._free(right)
+            self._dirty(left)
+        else:
+            parent.keys[separator], _ = self._split(left, right)
+        self._dirty(parent)
+
+    # --- Поиск ---
+
+    @staticmethod
+    def _prefix(key: Any) -> Key:
+        return key if isinstance(key, tuple) else (key,)
+
+    def _scan(self, lo: Optional[Any], hi: Optional[Any]) -> Iterator[Record]:
+        # Спуск к первому листу, где может быть ключ >= lo, затем проход по цепочке листов
+        lo = None if lo is None else self._prefix(lo)
+        upper = None if hi is None else self._prefix(hi) + (TOP,)
+        page = self._page(self.root)
+        while not page.leaf:
+            page = self._page(page.values[0 if lo is None else bisect_left(page.keys, lo)])
+        index = 0 if lo is None else bisect_left(page.keys, lo)
+        while True:
+            keys, values = page.keys, page.values
+            for index in range(index, len(keys)):
+                if upper is not None and upper < keys[index]:
+                    return
+                yield values[index]
+            if not page.next:
+                return
+            page = self._page(page.next)
+            index = 0
+
+    def iter_range(self, lo: Optional[Any] = None, hi: Optional[Any] = None) -> Iterator[Student]:
+        # Студенты с ключом в [lo, hi] по возрастанию; None - без ограничения.
+        # Дерево нельзя менять, пока обход не закончен
+        for record in self._scan(lo, hi):
+            yield Student(*record)
+
+    def __iter__(self) -> Iterator[Student]:
+        return self.iter_range()
+
+    def search(self, key: Any) -> bool:
+        return next(self._scan(key, key), None) is not None
+
+    def count(self, key: Any) -> int:
+        return sum(1 for _ in self._scan(key, key))
+
+def run_tests() -> None:
+    from avltree import AVLTree
+
+    def check(tree: BPlusTree) -> None:
+        # Все листья на одной глубине, страницы помещаются в размер, ключи упорядочены
+        depths = set()
+
+        def walk(page_id: int, depth: int) -> None:
+            page = tree._page(page_id)
+            assert tree._fits(page)
+            assert page.keys == sorted(page.keys)
+            if page.leaf:
+                depths.add(depth)
+                return
+            assert len(page.values) == len(page.keys) + 1
+            for child in list(page.values):
+                walk(child, depth + 1)
+
+        walk(tree.root, 0)
+        assert len(depths) == 1
+        keys = [tree._key(record) for record in tree._scan(None, None)]
+        assert keys == sorted(keys) and len(keys) == len(tree)
+
+    students = [Student(f"Студент {i}", f"Группа {i % 5}", 1 + i % 4, 18 + i % 5, ((i * 37) % 101) / 20)
+                for i in range(2000)]
+    try:
+        # Тест 1: Вставка, поиск и диапазоны совпадают с AVLTree (маленькие страницы и кеш)
+        tree = BPlusTree('test_btree.db', page_size=512, cache_pages=4)
+        avl = AVLTree()
+        for student in students:
+            tree.insert(student)
+            avl.insert(student)
+        assert len(tree) == 2000
+        check(tree)
+        assert [s.full_name for s in tree.iter_range(1.0, 3.0)] == [s.full_name for s in avl.iter_range(1.0, 3.0)]
+        assert [s.full_name for s in tree] == [s.full_name for s in avl.iter_range(-math.inf, math.inf)]
+        for grade in (0.0, 2.5, 5.0, 0.01, 5.1):
+            assert tree.search(grade) == avl.search(grade)
+            assert tree.count(grade) == avl.count(grade)
+
+        # Тест 2: Удаление по тем же правилам, что и в AVLTree
+        assert tree.delete(2.5).full_name == avl.delete(2.5).full_name
+        assert tree.delete(2.5, "Студент 116").full_name == avl.delete(2.5, "Студент 116").full_name
+        assert tree.delete(2.5, "Нет такого") is None and tree.delete(5.1) is None
+        for i in range(0, 2000, 3):
+            grade = students[i].average_grade
+            deleted = tree.delete(grade)
+            assert deleted.full_name == avl.delete(grade).full_name
+        check(tree)
+        assert [s.full_name for s in tree] == [s.full_name for s in avl.iter_range(-math.inf, math.inf)]
+
+        # Тест 3: Содержимое сохраняется после закрытия, освобождённые страницы используются снова
+        size = len(tree)
+        tree.close()
+        tree = BPlusTree('test_btree.db')
+        assert len(tree) == size and tree.page_size == 512
+        assert [s.full_name for s in tree] == [s.full_name for s in avl.iter_range(-math.inf, math.inf)]
+        assert tree.free_head != 0
+        page_count = tree.page_count
+        for student in students[:50]:
+            tree.insert(student)
+        assert tree.page_count == page_count
+        check(tree)
+
+        # Тест 4: Удаление всех студентов
+        for student in list(tree):
+            assert tree.delete(student.average_grade, student.full_name) is not None
+        assert len(tree) == 0 and list(tree) == [] and tree._page(tree.root).leaf
+        root = tree.root
+        tree.close()
+
+        # Тест 5: Повреждённая страница и чужой файл - ValueError
+        with open('test_btree.db', 'r+b') as f:
+            f.seek(root * 512 + LENGTH.size)
+            f.write(b'\xff' * 16)
+        tree = BPlusTree('test_btree.db')
+        try:
+            list(tree)
+            assert False, "Ожидалась ошибка ValueError"
+        except ValueError:
+            pass
+        tree.close()
+        with open('test_btree.db', 'wb') as f:
+            f.write(b'not a tree')
+        try:
+            BPlusTree('test_btree.db')
+            assert False, "Ожидалась ошибка ValueError"
+        except ValueError:
+            pass
+        os.remove('test_btree.db')
+
+        # Тест 6: Вперемешку вставки и удаления с маленькими страницами и кешем:
+        # слияние страниц не должно давать страницу больше page_size
+        tree = BPlusTree('test_btree.db', page_size=256, cache_pages=4)
+        expected = []
+        for i in range(3000):
+            student = Student(f"Студент {'x' * ((i * 7) % 12)}{i}", "Г1", 1, 18, ((i * 53) % 31) / 4)
+            tree.insert(student)
+            expected.append(student)
+            if i % 5 in (1, 3):
+                victim = expected.pop((i * 7919) % len(expected))
+                assert tree.delete(victim.average_grade, victim.full_name).full_name == victim.full_name
+        check(tree)
+        tree.close()
+        tree = BPlusTree('test_btree.db')
+        assert sorted((s.average_grade, s.full_name) for s in tree) == \
+            sorted((s.average_grade, s.full_name) for s in expected)
+        tree.close()
+        os.remove('test_btree.db')
+
+        # Тест 7: Составной ключ и поиск по префиксу
+        with BPlusTree('test_btree2.db', key_fields=('group_number', 'average_grade'),
+                       page_size=512, cache_pages=8) as tree:
+            for student in students:
+                tree.insert(student)
+            check(tree)
+            group = sorted((s for s in students if s.group_number == "Группа 1"), key=lambda s: s.average_grade)
+            assert [s.full_name for s in tree.iter_range("Группа 1", "Группа 1")] == [s.full_name for s in group]
+            assert [s.full_name for s in tree.iter_range(("Группа 1", 2.0), ("Группа 1", 3.0))] == \
+                [s.full_name for s in group if 2.0 <= s.average_grade <= 3.0]
+            assert tree.search(("Группа 4", 0.0)) == any(s.group_number == "Группа 4" and s.average_grade == 0.0
+                                                          for s in students)
+            assert tree.count("Группа 2") == 400
+            assert tree.delete("Группа 3").group_number == "Группа 3"
+        try:
+            BPlusTree('test_btree2.db', key_fields=('average_grade',))
+            assert False, "Ожидалась ошибка ValueError"
+        except ValueError:
+            pass
+    finally:
+        for filename in ('test_btree.db', 'test_btree2.db'):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+def benchmark(n: int = 2 * 10 ** 5, queries: int = 2000) -> None:
+    filename = 'benchmark_btree.db'
+    students = [Student(f"Student {i}", f"Group {i % 100}", (i % 4) + 1, 18 + (i % 5), ((i * 7919) % n) / 100)
+                for i in range(n)]
+    try:
+        with BPlusTree(filename) as tree:
+            start_time = time.time()
+            for student in students:
+                tree.insert(student)
+            print(f"Time to insert {n} students into BPlusTree: {time.time() - start_time:.6f} seconds")
+        print(f"File size: {os.path.getsize(filename) / n:.1f} bytes per student")
+
+        # Поиск с кешем разного размера: число чтений страниц с диска
+        for cache_pages in (16, 256, 4096):
+            with BPlusTree(filename, cache_pages=cache_pages) as tree:
+                start_time = time.time()
+                for q in range(queries):
+                    tree.search(((q * 104729) % n) / 100)
+                elapsed = time.time() - start_time
+                print(f"{queries} searches, cache {cache_pages} pages: {elapsed:.6f} seconds, "
+                      f"{tree.reads} page reads, {tree.hits} cache hits")
+
+        # Память при полном обходе ограничена кешем, а не размером списка
+        del students
+        tracemalloc.start()
+        with BPlusTree(filename, cache_pages=64) as tree:
+            start_time = time.time()
+            total = sum(1 for _ in tree.iter_range())
+            elapsed = time.time() - start_time
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"Full scan of {total} students: {elapsed:.6f} seconds, peak memory {peak / 1024:.0f} KiB")
+    finally:
+        if os.path.exists(filename):
+            os.remove(filename)
+
+if __name__ == "__main__":
+    benchmark()
+    run_tests()
@@ -0,0 +1,259 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from queue import Empty
+from typing import Deque, Iterable, List, Optional
+
+from kucha import MaxHeap, Student
+
+class ConcurrentMaxHeap:
+    # Потокобезопасная обёртка над MaxHeap: все операции идут под одной блокировкой,
+    # ожидающие get() просыпаются через условную переменную
+    def __init__(self) -> None:
+        self.heap = MaxHeap()
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+
+    @property
+    def size(self) -> int:
+        with self.lock:
+            return self.heap.size
+
+    def put(self, student: Student) -> None:
+        with self.lock:
+            self.heap.insert(student)
+            self.not_empty.notify()
+
+    def put_many(self, students: Iterable[Student]) -> None:
+        # Одна блокировка на всю пачку вместо захвата на каждого студента
+        students = list(students)
+        if not students:
+            return
+        with self.lock:
+            self.heap.extend(students)
+            self.not_empty.notify(len(students))
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Student:
+        # Как queue.Queue.get: при пустой куче ждёт не дольше timeout и бросает queue.Empty
+        with self.not_empty:
+            self._wait(block, timeout)
+            return self.heap.extract_max()
+
+    def get_many(self, max_items: int, block: bool = True, timeout: Optional[float] = None) -> List[Student]:
+        # Ждёт хотя бы одного студента, затем забирает до max_items за один захват блокировки
+        with self.not_empty:
+            self._wait(block, timeout)
+            count = min(max_items, self.heap.size)
+            students = [self.heap.extract_max() for _ in range(count)]
+            if self.heap.size:
+                self.not_empty.notify()
+            return students
+
+    def _wait(self, block: bool, timeout: Optional[float]) -> None:
+        if not block:
+            if not self.heap.size:
+                raise Empty
+        elif timeout is None:
+            while not self.heap.size:
+                self.not_empty.wait()
+        else:
+            deadline = time.monotonic() + timeout
+            while not self.heap.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise Empty
+                self.not_empty.wait(remaining)
+
+class AsyncMaxHeap:
+    # Вариант для asyncio по образцу asyncio.Queue: put() синхронный и не блокирует,
+    # get() - корутина. Не потокобезопасен: из других потоков вызывайте
+    # loop.call_soon_threadsafe(heap.put, student)
+    def __init__(self) -> None:
+        self.heap = MaxHeap()
+        self.getters: Deque[asyncio.Future] = deque()
+
+    @property
+    def size(self) -> int:
+        return self.heap.size
+
+    def put(self, student: Student) -> None:
+        self.heap.insert(student)
+        self._wakeup(1)
+
+    def put_many(self, students: Iterable[Student]) -> None:
+        before = self.heap.size
+        self.heap.extend(students)
+        self._wakeup(self.heap.size - before)
+
+    def get_nowait(self) -> Student:
+        if not self.heap.size:
+            raise asyncio.QueueEmpty
+        return self.heap.extract_max()
+
+    async def get(self) -> Student:
+        await self._wait()
+        return self.heap.extract_max()
+
+    async def get_many(self, max_items: int) -> List[Student]:
+        await self._wait()
+        count = min(max_items, self.heap.size)
+        students = [self.heap.extract_max() for _ in range(count)]
+        if self.heap.size:
+            self._wakeup(1)
+        return students
+
+    async def _wait(self) -> None:
+        while not self.heap.size:
+            getter = asyncio.get_running_loop().create_future()
+            self.getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                try:
+                    self.getters.remove(getter)
+                except ValueError:
+                    pass
+                # Нас разбудили, но корутину отменили - передаём сигнал следующему
+                if self.heap.size and not getter.cancelled():
+                    self._wakeup(1)
+                raise
+
+    def _wakeup(self, count: int) -> None:
+        while count > 0 and self.getters:
+            getter = self.getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                count -= 1
+
+def run_tests() -> None:
+    # Тест 1: Порядок извлечения и неблокирующий режим
+    heap = ConcurrentMaxHeap()
+    heap.put(Student("Иванов Иван", "Группа 1", 1, 18, 4.5))
+    heap.put_many([Student("Петров Петр", "Группа 2", 2, 19, 3.5),
+                   Student("Сидоров Сидор", "Группа 3", 3, 20, 4.0)])
+    assert heap.get().full_name == "Иванов Иван"
+    assert [s.average_grade for s in heap.get_many(5)] == [4.0, 3.5]
+    try:
+        heap.get(block=False)
+        assert False, "Ожидалось исключение queue.Empty"
+    except Empty:
+        pass
+    try:
+        heap.get(timeout=0.01)
+        assert False, "Ожидалось исключение queue.Empty"
+    except Empty:
+        pass
+
+    # Тест 2: Заблокированный get() дожидается put() из другого потока
+    result: List[Student] = []
+    consumer = threading.Thread(target=lambda: result.append(heap.get(timeout=5)))
+    consumer.start()
+    time.sleep(0.01)
+    heap.put(Student("Смирнов Олег", "Группа 4", 1, 18, 4.8))
+    consumer.join()
+    assert result[0].full_name == "Смирнов Олег"
+
+    # Тест 3: Несколько производителей и потребителей не теряют студентов
+    heap = ConcurrentMaxHeap()
+    consumed: List[Student] = []
+    consumed_lock = threading.Lock()
+    done = threading.Event()
+
+    def produce(p: int) -> None:
+        for i in range(0, 200, 10):
+            heap.put_many(Student(f"Student {p}-{j}", "Группа 1", 1, 18, j / 100) for j in range(i, i + 10))
+
+    def consume() -> None:
+        while True:
+            try:
+                students = heap.get_many(7, timeout=0.01)
+            except Empty:
+                if done.is_set():
+                    return
+                continue
+            with consumed_lock:
+                consumed.extend(students)
+
+    producer_threads = [threading.Thread(target=produce, args=(p,)) for p in range(4)]
+    consumer_threads = [threading.Thread(target=consume) for _ in range(3)]
+    for thread in producer_threads + consumer_threads:
+        thread.start()
+    for thread in producer_threads:
+        thread.join()
+    done.set()
+    for thread in consumer_threads:
+        thread.join()
+    assert len(consumed) == 800
+    assert len({s.full_name for s in consumed}) == 800
+
+    # Тест 4: asyncio-вариант
+    async def async_tests() -> None:
+        async_heap = AsyncMaxHeap()
+        waiter = asyncio.ensure_future(async_heap.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        async_heap.put_many([Student("Иванов Иван", "Группа 1", 1, 18, 4.5),
+                             Student("Петров Петр", "Группа 2", 2, 19, 3.5)])
+        assert (await waiter).full_name == "Иванов Иван"
+        assert [s.average_grade for s in await async_heap.get_many(10)] == [3.5]
+        try:
+            async_heap.get_nowait()
+            assert False, "Ожидалось исключение asyncio.QueueEmpty"
+        except asyncio.QueueEmpty:
+            pass
+
+        # Отменённый get() не забирает студента
+        cancelled = asyncio.ensure_future(async_heap.get())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        async_heap.put(Student("Сидоров Сидор", "Группа 3", 3, 20, 4.0))
+        assert (await asyncio.wait_for(async_heap.get(), 1)).full_name == "Сидоров Сидор"
+
+    asyncio.run(async_tests())
+
+def benchmark(producers: int = 4, consumers: int = 4, per_producer: int = 50000, batch: int = 100) -> None:
+    for batch_size in (1, batch):
+        heap = ConcurrentMaxHeap()
+        done = threading.Event()
+
+        def produce(p: int) -> None:
+            students = [Student(f"Student {p}-{i}", f"Group {p}", 1, 18, (i * 7919) % 1000 / 200)
+                        for i in range(per_producer)]
+            if batch_size == 1:
+                for student in students:
+                    heap.put(student)
+            else:
+                for i in range(0, per_producer, batch_size):
+                    heap.put_many(students[i:i + batch_size])
+
+        def consume() -> None:
+            while True:
+                try:
+                    if batch_size == 1:
+                        heap.get(timeout=0.01)
+                    else:
+                        heap.get_many(batch_size, timeout=0.01)
+                except Empty:
+                    if done.is_set():
+                        return
+
+        producer_threads = [threading.Thread(target=produce, args=(p,)) for p in range(producers)]
+        consumer_threads = [threading.Thread(target=consume) for _ in range(consumers)]
+        start_time = time.time()
+        for thread in producer_threads + consumer_threads:
+            thread.start()
+        for thread in producer_threads:
+            thread.join()
+        done.set()
+        for thread in consumer_threads:
+            thread.join()
+        elapsed = time.time() - start_time
+        total = producers * per_producer
+        print(f"{producers} producers / {consumers} consumers, batch {batch_size}: "
+              f"{total} students in {elapsed:.6f} seconds ({total / elapsed:.0f} students/s)")
+
+if __name__ == "__main__":
+    benchmark()
+    run_tests()
@@ -0,0 +1,185 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from kucha import Student
+
+StudentKey = Tuple[str, str]
+
+def student_key(student: Student) -> StudentKey:
+    # Студент однозначно определяется ФИО и номером группы
+    return student.full_name, student.group_number
+
+class IndexedMaxHeap:
+    # Куча в массиве плюс словарь "ключ студента -> позиция в массиве",
+    # который обновляется при каждом перемещении элемента
+    def __init__(self) -> None:
+        self.heap: List[Student] = []
+        self.positions: Dict[StudentKey, int] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.heap)
+
+    def contains(self, key: StudentKey) -> bool:
+        return key in self.positions
+
+    def get(self, key: StudentKey) -> Optional[Student]:
+        index = self.positions.get(key)
+        return None if index is None else self.heap[index]
+
+    def insert(self, student: Student) -> None:
+        key = student_key(student)
+        if key in self.positions:
+            raise KeyError(f"Студент {key} уже есть в куче")
+        self.heap.append(student)
+        self.positions[key] = len(self.heap) - 1
+        self._heapify_up(len(self.heap) - 1)
+
+    def extract_max(self) -> Optional[Student]:
+        if not self.heap:
+            return None
+        return self._remove_at(0)
+
+    def remove(self, key: StudentKey) -> Optional[Student]:
+        index = self.positions.get(key)
+        if index is None:
+            return None
+        return self._remove_at(index)
+
+    def update_grade(self, key: StudentKey, new_grade: float) -> None:
+        index = self.positions.get(key)
+        if index is None:
+            raise KeyError(f"Студент {key} не найден")
+        student = self.heap[index]
+        old_grade = student.average_grade
+        student.average_grade = new_grade
+        if new_grade > old_grade:
+            self._heapify_up(index)
+        elif new_grade < old_grade:
+            self._heapify_down(index)
+
+    def _remove_at(self, index: int) -> Student:
+        heap = self.heap
+        student = heap[index]
+        del self.positions[student_key(student)]
+        last_student = heap.pop()
+        if index < len(heap):
+            # На освободившееся место ставим последний элемент и просеиваем его
+            # в ту сторону, куда нарушен порядок
+            heap[index] = last_student
+            self.positions[student_key(last_student)] = index
+            if index > 0 and last_student.average_grade > heap[(index - 1) // 2].average_grade:
+                self._heapify_up(index)
+            else:
+                self._heapify_down(index)
+        return student
+
+    def _heapify_up(self, index: int) -> None:
+        heap = self.heap
+        positions = self.positions
+        student = heap[index]
+        grade = student.average_grade
+        while index > 0:
+            parent_index = (index - 1) // 2
+            parent = heap[parent_index]
+            if grade > parent.average_grade:
+                heap[index] = parent
+                positions[student_key(parent)] = index
+                index = parent_index
+            else:
+                break
+        heap[index] = student
+        positions[student_key(student)] = index
+
+    def _heapify_down(self, index: int) -> None:
+        heap = self.heap
+        positions = self.positions
+        size = len(heap)
+        student = heap[index]
+        grade = student.average_grade
+        while True:
+            largest_index = 2 * index + 1
+            if largest_index >= size:
+                break
+            right_index = largest_index + 1
+            if right_index < size and heap[right_index].average_grade > heap[largest_index].average_grade:
+                largest_index = right_index
+            child = heap[largest_index]
+            if child.average_grade > grade:
+                heap[index] = child
+                positions[student_key(child)] = index
+                index = largest_index
+            else:
+                break
+        heap[index] = student
+        positions[student_key(student)] = index
+
+def run_tests() -> None:
+    heap = IndexedMaxHeap()
+
+    # Тест 1: Вставка и проверка наличия
+    heap.insert(Student("Иванов Иван", "Группа 1", 1, 18, 4.5))
+    heap.insert(Student("Петров Петр", "Группа 2", 2, 19, 3.5))
+    heap.insert(Student("Сидоров Сидор", "Группа 3", 3, 20, 4.0))
+    heap.insert(Student("Иванов Иван", "Группа 2", 2, 19, 3.9))
+    assert heap.contains(("Иванов Иван", "Группа 1")) == True
+    assert heap.contains(("Иванов Иван", "Группа 2")) == True
+    assert heap.contains(("Иванов Иван", "Группа 3")) == False
+
+    # Тест 2: Повторная вставка того же студента запрещена
+    try:
+        heap.insert(Student("Петров Петр", "Группа 2", 2, 19, 5.0))
+        assert False, "Ожидалась ошибка KeyError"
+    except KeyError:
+        pass
+
+    # Тест 3: Изменение оценки перестраивает кучу
+    heap.update_grade(("Петров Петр", "Группа 2"), 4.8)
+    assert heap.extract_max().full_name == "Петров Петр"
+    heap.update_grade(("Иванов Иван", "Группа 1"), 3.0)
+    assert heap.extract_max().average_grade == 4.0
+
+    # Тест 4: Удаление по ключу
+    removed = heap.remove(("Иванов Иван", "Группа 1"))
+    assert removed.average_grade == 3.0
+    assert heap.contains(("Иванов Иван", "Группа 1")) == False
+    assert heap.remove(("Иванов Иван", "Группа 1")) is None
+    assert heap.size == 1
+    assert heap.extract_max().group_number == "Группа 2"
+    assert heap.extract_max() is None
+
+    # Тест 5: Позиции согласованы с массивом после смешанных операций
+    heap = IndexedMaxHeap()
+    for i in range(200):
+        heap.insert(Student(f"Student {i}", "Группа 1", 1, 18, (i * 37) % 101 / 20))
+    for i in range(0, 200, 3):
+        heap.update_grade((f"Student {i}", "Группа 1"), (i * 53) % 97 / 20)
+    for i in range(0, 200, 7):
+        heap.remove((f"Student {i}", "Группа 1"))
+    for key, index in heap.positions.items():
+        assert student_key(heap.heap[index]) == key
+    extracted = [heap.extract_max().average_grade for _ in range(heap.size)]
+    assert extracted == sorted(extracted, reverse=True)
+
+def benchmark(n: int = 100000) -> None:
+    heap = IndexedMaxHeap()
+    keys = [(f"Student {i}", f"Group {i % 100}") for i in range(n)]
+
+    start_time = time.time()
+    for i, (full_name, group_number) in enumerate(keys):
+        heap.insert(Student(full_name, group_number, (i % 4) + 1, 18 + (i % 5), (i * 37) % 101 / 20))
+    print(f"Time to push {n} students: {time.time() - start_time:.6f} seconds")
+
+    start_time = time.time()
+    for i, key in enumerate(keys):
+        heap.update_grade(key, (i * 53) % 97 / 20)
+    print(f"Time to update {n} grades: {time.time() - start_time:.6f} seconds")
+
+    start_time = time.time()
+    for key in keys[::2]:
+        heap.remove(key)
+    print(f"Time to remove {n // 2} students by key: {time.time() - start_time:.6f} seconds")
+
+if __name__ == "__main__":
+    benchmark()
+    run_tests()
@@ -1,10 +1,19 @@
+import sys
 import time
-from typing import Optional
+import tracemalloc
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from roster_format import RosterFile, write_roster
 
 class Student:
+    # __slots__ убирает у каждого объекта словарь атрибутов, а номер группы
+    # интернируется: у тысяч студентов одной группы будет одна строка на всех
+    __slots__ = ('full_name', 'group_number', 'course', 'age', 'average_grade')
+
     def __init__(self, full_name: str, group_number: str, course: int, age: int, average_grade: float) -> None:
         self.full_name = full_name
-        self.group_number = group_number
+        self.group_number = sys.intern(group_number)
         self.course = course
         self.age = age
         self.average_grade = average_grade
@@ -12,127 +21,193 @@ class Student:
     def __repr__(self) -> str:
         return f"Student({self.full_name}, {self.group_number}, {self.course}, {self.age}, {self.average_grade})"
 
-class Node:
-    def __init__(self, student: Student) -> None:
-        self.student = student
-        self.prev: Optional['Node'] = None
-        self.next: Optional['Node'] = None
+# Размер блока, которым читается файл со списком студентов
+READ_CHUNK_SIZE = 1 << 20
+
+def split_fields(text: str, count: int) -> List[str]:
+    # Поля всех строк блока одним списком. Число запятых проверяется в каждой
+    # строке: проверка только общего числа полей пропустила бы строку с лишним
+    # полем рядом со строкой без поля, и все поля между ними сдвинулись бы
+    lines = text.replace('\r', '').split('\n')
+    if set(map(str.count, lines, repeat(','))) != {count - 1}:
+        raise ValueError(f"Некорректный формат файла: ожидается {count} полей в строке")
+    return ','.join(lines).split(',')
+
+def parse_students(text: str) -> List[Student]:
+    # Разбираем сразу весь блок строк: каждое поле берётся срезом с шагом 5,
+    # без split(',') на каждую строку
+    fields = split_fields(text, 5)
+    return list(map(Student, fields[0::5], fields[1::5],
+                    map(int, fields[2::5]), map(int, fields[3::5]), map(float, fields[4::5])))
+
+def read_students(filename: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Student]:
+    # Читаем файл крупными блоками; неполная последняя строка блока
+    # переносится в начало следующего
+    with open(filename, 'r', encoding='utf-8') as f:
+        tail = ''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            chunk = tail + chunk
+            end = chunk.rfind('\n')
+            if end == -1:
+                tail = chunk
+                continue
+            tail = chunk[end + 1:]
+            text = chunk[:end].strip('\n')
+            if text:
+                yield from parse_students(text)
+        tail = tail.strip()
+        if tail:
+            yield from parse_students(tail)
 
 class MaxHeap:
+    # Куча хранится в непрерывном массиве: потомки элемента i лежат в 2i+1 и 2i+2,
+    # поэтому родитель и дети находятся за O(1), а просеивание стоит O(log n)
     def __init__(self) -> None:
-        self.head: Optional[Node] = None
-        self.tail: Optional[Node] = None
-        self.size: int = 0
-
-    def _parent_index(self, index: int) -> int:
-        return (index - 1) // 2
-
-    def _left_index(self, index: int) -> int:
-        return 2 * index + 1
-
-    def _right_index(self, index: int) -> int:
-        return 2 * index + 2
-
-    def _swap(self, node1: Node, node2: Node) -> None:
-        node1.student, node2.student = node2.student, node1.student
+        self.heap: List[Student] = []
+        # Вспомогательный индекс: оценка -> число студентов с ней и ссылки на них.
+        # Студент сам служит ключом (хеш по объекту), значение - сколько раз этот
+        # объект лежит в куче; малые целые в Python общие, поэтому на студента
+        # приходится только запись словаря, без отдельных объектов
+        self.grade_counts: Dict[float, int] = {}
+        self.grade_students: Dict[float, Dict[Student, int]] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.heap)
 
     def insert(self, student: Student) -> None:
-        new_node = Node(student)
-        if not self.head:
-            self.head = new_node
-            self.tail = new_node
+        self.heap.append(student)
+        self._index_add(student)
+        self._heapify_up(len(self.heap) - 1)
+
+    @classmethod
+    def from_students(cls, students: Iterable[Student]) -> 'MaxHeap':
+        heap = cls()
+        heap.heap = list(students)
+        for student in heap.heap:
+            heap._index_add(student)
+        heap._heapify()
+        return heap
+
+    def extend(self, students: Iterable[Student]) -> None:
+        start = len(self.heap)
+        self.heap.extend(students)
+        added = len(self.heap) - start
+        for index in range(start, len(self.heap)):
+            self._index_add(self.heap[index])
+        # Немного новых элементов дешевле просеять вверх по одному (k log n),
+        # иначе перестраиваем всю кучу снизу вверх за O(n)
+        if added * max(start, 1).bit_length() < len(self.heap):
+            for index in range(start, len(self.heap)):
+                self._heapify_up(index)
         else:
-            self.tail.next = new_node
-            new_node.prev = self.tail
-            self.tail = new_node
-            self._heapify_up(self.size)
+            self._heapify()
 
-        self.size += 1
+    def _heapify(self) -> None:
+        # Построение снизу вверх: просеиваем вниз все внутренние узлы, начиная с последнего
+        for index in range(len(self.heap) // 2 - 1, -1, -1):
+            self._heapify_down(index)
 
     def _heapify_up(self, index: int) -> None:
-        current_index = index
-        while current_index > 0:
-            parent_index = self._parent_index(current_index)
-            if self._get_student_at_index(current_index).average_grade > self._get_student_at_index(parent_index).average_grade:
-                self._swap(self._get_node_at_index(current_index), self._get_node_at_index(parent_index))
-                current_index = parent_index
+        # Вместо попарных обменов сдвигаем родителей вниз и ставим элемент один раз
+        heap = self.heap
+        student = heap[index]
+        grade = student.average_grade
+        while index > 0:
+            parent_index = (index - 1) // 2
+            parent = heap[parent_index]
+            if grade > parent.average_grade:
+                heap[index] = parent
+                index = parent_index
             else:
                 break
+        heap[index] = student
 
     def extract_max(self) -> Optional[Student]:
-        if self.size == 0:
+        if not self.heap:
             return None
 
-        max_student = self.head.student
-        if self.size == 1:
-            self.head = None
-            self.tail = None
-        else:
-            self.head = self.head.next
-            if self.head:
-                self.head.prev = None
-
-        self.size -= 1
-        if self.size > 0:
-            self._heapify_down(0)
+        last_student = self.heap.pop()
+        if not self.heap:
+            self._index_remove(last_student)
+            return last_student
 
+        max_student = self.heap[0]
+        self.heap[0] = last_student
+        self._heapify_down(0)
+        self._index_remove(max_student)
         return max_student
 
-    def _heapify_down(self, index: int) -> None:
-        current_index = index
-        while current_index < self.size:
-            left_index = self._left_index(current_index)
-            right_index = self._right_index(current_index)
-            largest_index = current_index
-
-            if left_index < self.size and self._get_student_at_index(left_index).average_grade > self._get_student_at_index(largest_index).average_grade:
-                largest_index = left_index
+    def _index_add(self, student: Student) -> None:
+        grade = student.average_grade
+        self.grade_counts[grade] = self.grade_counts.get(grade, 0) + 1
+        bucket = self.grade_students.setdefault(grade, {})
+        bucket[student] = bucket.get(student, 0) + 1
+
+    def _index_remove(self, student: Student) -> None:
+        grade = student.average_grade
+        count = self.grade_counts[grade] - 1
+        bucket = self.grade_students[grade]
+        if count:
+            self.grade_counts[grade] = count
+            copies = bucket[student] - 1
+            if copies:
+                bucket[student] = copies
+            else:
+                del bucket[student]
+        else:
+            del self.grade_counts[grade]
+            del self.grade_students[grade]
 
-            if right_index < self.size and self._get_student_at_index(right_index).average_grade > self._get_student_at_index(largest_index).average_grade:
+    def _heapify_down(self, index: int) -> None:
+        heap = self.heap
+        size = len(heap)
+        student = heap[index]
+        grade = student.average_grade
+        while True:
+            largest_index = 2 * index + 1
+            if largest_index >= size:
+                break
+            right_index = largest_index + 1
+            if right_index < size and heap[right_index].average_grade > heap[largest_index].average_grade:
                 largest_index = right_index
-
-            if largest_index != current_index:
-                self._swap(self._get_node_at_index(current_index), self._get_node_at_index(largest_index))
-                current_index = largest_index
+            if heap[largest_index].average_grade > grade:
+                heap[index] = heap[largest_index]
+                index = largest_index
             else:
                 break
-
-    def _get_student_at_index(self, index: int) -> Student:
-        current = self.head
-        for _ in range(index):
-            current = current.next
-        return current.student
-
-    def _get_node_at_index(self, index: int) -> Node:
-        current = self.head
-        for _ in range(index):
-            current = current.next
-        return current
+        heap[index] = student
 
     def save_to_file(self, filename: str) -> None:
         with open(filename, 'w', encoding='utf-8') as f:
-            current = self.head
-            while current:
-                f.write(f"{current.student.full_name},{current.student.group_number},{current.student.course},"
-                         f"{current.student.age},{current.student.average_grade}\n")
-                current = current.next
+            for student in self.heap:
+                f.write(f"{student.full_name},{student.group_number},{student.course},"
+                        f"{student.age},{student.average_grade}\n")
 
     def load_from_file(self, filename: str) -> None:
-        with open(filename, 'r', encoding='utf-8') as f:
-            for line in f:
-                full_name, group_number, course, age, average_grade = line.strip().split(',')
-                student = Student(full_name=full_name, group_number=group_number,
-                                  course=int(course), age=int(age),
-                                  average_grade=float(average_grade))
-                self.insert(student)
+        self.extend(read_students(filename))
+
+    def save_binary(self, filename: str) -> None:
+        write_roster(filename, self.heap)
+
+    def load_binary(self, filename: str) -> None:
+        with RosterFile(filename, Student) as roster:
+            self.extend(roster)
 
     def search(self, average_grade: float) -> bool:
-        current = self.head
-        while current:
-            if current.student.average_grade == average_grade:
-                return True
-            current = current.next
-        return False
+        return average_grade in self.grade_counts
+
+    def count(self, average_grade: float) -> int:
+        return self.grade_counts.get(average_grade, 0)
+
+    def find_all(self, average_grade: float) -> List[Student]:
+        bucket = self.grade_students.get(average_grade)
+        if not bucket:
+            return []
+        return [student for student, copies in bucket.items() for _ in range(copies)]
 
 def run_tests() -> None:
     heap = MaxHeap()
@@ -170,21 +245,123 @@ def run_tests() -> None:
     assert new_heap.search(3.5) == True  # Проверяем, что 3.5 остался
     assert new_heap.search(5.0) == False  # Не найден студент с оценкой 5.0
 
-def benchmark() -> None:
+    # Тест 6: Извлечение возвращает студентов по убыванию оценки
     heap = MaxHeap()
-    start_time = time.time()
-
-    # Вставка 1000 студентов
-    for i in range(1000):
-        heap.insert(Student(f"Student {i}", f"Group {i}", (i % 10) + 1, 18 + (i % 5), 4.0 + (i % 10) * 0.1))
-    print(f"Time to push 1000 students: {time.time() - start_time:.6f} seconds")
-
-    # Извлечение 1000 студентов
-    start_time = time.time()
-    for _ in range(1000):
-        heap.extract_max()
-    print(f"Time to extract 1000 students: {time.time() - start_time:.6f} seconds")
+    grades = [3.7, 4.9, 2.5, 4.1, 4.9, 3.0, 5.0, 3.3, 4.4, 2.8]
+    for i, grade in enumerate(grades):
+        heap.insert(Student(f"Student {i}", "Группа 1", 1, 18, grade))
+    extracted = [heap.extract_max().average_grade for _ in range(len(grades))]
+    assert extracted == sorted(grades, reverse=True)
+    assert heap.extract_max() is None
+    assert heap.size == 0
+
+    # Тест 7: Построение кучи целиком и пакетное добавление
+    students = [Student(f"Student {i}", "Группа 2", 2, 19, grade) for i, grade in enumerate(grades)]
+    heap = MaxHeap.from_students(students[:6])
+    heap.extend(students[6:7])
+    heap.extend(students[7:])
+    assert heap.size == len(grades)
+    extracted = [heap.extract_max().average_grade for _ in range(len(grades))]
+    assert extracted == sorted(grades, reverse=True)
+
+    # Тест 8: Разбор файла блоками, строка разрезана границей блока
+    heap = MaxHeap.from_students(students)
+    heap.save_to_file('test_students2.txt')
+    loaded = list(read_students('test_students2.txt', chunk_size=7))
+    assert [(s.full_name, s.average_grade) for s in loaded] == [(s.full_name, s.average_grade) for s in heap.heap]
+    new_heap.save_to_file('test_students2.txt')
+    try:
+        # Сдвинутые поля здесь разобрались бы как числа: ошибку даёт только проверка строк
+        parse_students("Иванов Иван,Группа 1,1,18\n4.5,Петров Петр,Группа 2,2,19,3.5")
+        assert False, "Ожидалась ошибка ValueError"
+    except ValueError:
+        pass
+
+    # Тест 9: Индекс по оценкам согласован с кучей
+    heap = MaxHeap()
+    heap.insert(students[0])
+    heap.insert(students[0])
+    heap.extend(students[1:])
+    assert heap.count(4.9) == 2
+    assert {s.full_name for s in heap.find_all(4.9)} == {"Student 1", "Student 4"}
+    assert [s.full_name for s in heap.find_all(3.7)] == ["Student 0", "Student 0"]
+    assert heap.find_all(1.0) == []
+    heap.extract_max()
+    heap.extract_max()
+    assert heap.count(4.9) == 1
+    while heap.size:
+        student = heap.extract_max()
+        assert heap.count(student.average_grade) == len(heap.find_all(student.average_grade))
+    assert heap.grade_counts == {} and heap.grade_students == {}
+    assert new_heap.find_all(3.5)[0].full_name == "Петров Петр"
+
+def benchmark(sizes: Tuple[int, ...] = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)) -> None:
+    for n in sizes:
+        students = [Student(f"Student {i}", f"Group {i}", (i % 10) + 1, 18 + (i % 5), 4.0 + (i % 10) * 0.1)
+                    for i in range(n)]
+        heap = MaxHeap()
+
+        # Вставка n студентов
+        start_time = time.time()
+        for student in students:
+            heap.insert(student)
+        push_time = time.time() - start_time
+        print(f"Time to push {n} students: {push_time:.6f} seconds ({push_time / n * 1e6:.3f} us/op)")
+
+        # Поиск по оценке через индекс
+        start_time = time.time()
+        for i in range(1000):
+            heap.search(4.0 + (i % 20) * 0.1)
+        print(f"Time to search 1000 grades among {n} students: {time.time() - start_time:.6f} seconds")
+
+        # Извлечение n студентов
+        start_time = time.time()
+        for _ in range(n):
+            heap.extract_max()
+        extract_time = time.time() - start_time
+        print(f"Time to extract {n} students: {extract_time:.6f} seconds ({extract_time / n * 1e6:.3f} us/op)")
+
+        # Построение кучи из готового списка за O(n)
+        start_time = time.time()
+        MaxHeap.from_students(students)
+        print(f"Time to build heap of {n} students: {time.time() - start_time:.6f} seconds")
+
+def benchmark_memory(n: int = 10 ** 5) -> None:
+    # Сравнение байтов на студента (tracemalloc) для прежнего представления -
+    # обычного класса со словарём атрибутов - и текущего Student
+    class PlainStudent:
+        def __init__(self, full_name: str, group_number: str, course: int, age: int, average_grade: float) -> None:
+            self.full_name = full_name
+            self.group_number = group_number
+            self.course = course
+            self.age = age
+            self.average_grade = average_grade
+
+    text = '\n'.join(f"Student {i},Group {i % 100},{(i % 4) + 1},{18 + (i % 5)},{(i * 7919) % 1000 / 200}"
+                     for i in range(n))
+    for name, cls in (("plain class", PlainStudent), ("Student with __slots__", Student)):
+        tracemalloc.start()
+        fields = text.replace('\n', ',').split(',')
+        students = list(map(cls, fields[0::5], fields[1::5],
+                            map(int, fields[2::5]), map(int, fields[3::5]), map(float, fields[4::5])))
+        del fields
+        students_bytes = tracemalloc.get_traced_memory()[0]
+        if cls is not Student:
+            tracemalloc.stop()
+            print(f"{name}: {students_bytes / n:.1f} bytes per student")
+            continue
+        heap = MaxHeap.from_students(students)
+        total_bytes = tracemalloc.get_traced_memory()[0]
+        # Стоимость индекса по оценкам - сколько памяти освобождается без него
+        heap.grade_counts = {}
+        heap.grade_students = {}
+        index_bytes = total_bytes - tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{name}: {students_bytes / n:.1f} bytes per student, {total_bytes / n:.1f} with MaxHeap "
+              f"(heap array {(total_bytes - students_bytes - index_bytes) / n:.1f}, "
+              f"grade index {index_bytes / n:.1f})")
 
 if __name__ == "__main__":
     benchmark()
+    benchmark_memory()
     run_tests()
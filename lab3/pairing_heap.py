@@ -0,0 +1,219 @@
+import os
+import time
+from typing import Iterable, List, Optional
+
+from kucha import MaxHeap, Student, read_students
+
+class PairingNode:
+    __slots__ = ('student', 'child', 'sibling')
+
+    def __init__(self, student: Student) -> None:
+        self.student = student
+        self.child: Optional['PairingNode'] = None
+        self.sibling: Optional['PairingNode'] = None
+
+class PairingHeap:
+    # Max-куча спариваний: слияние двух куч - одно сравнение корней (O(1)),
+    # извлечение максимума - амортизированно O(log n)
+    def __init__(self) -> None:
+        self.root: Optional[PairingNode] = None
+        self.size: int = 0
+
+    @staticmethod
+    def _link(first: PairingNode, second: PairingNode) -> PairingNode:
+        # Корень с меньшей оценкой становится первым ребёнком другого
+        if second.student.average_grade > first.student.average_grade:
+            first, second = second, first
+        second.sibling = first.child
+        first.child = second
+        return first
+
+    def insert(self, student: Student) -> None:
+        node = PairingNode(student)
+        self.root = node if self.root is None else self._link(self.root, node)
+        self.size += 1
+
+    def extend(self, students: Iterable[Student]) -> None:
+        for student in students:
+            self.insert(student)
+
+    def meld(self, other: 'PairingHeap') -> None:
+        # Забирает все элементы other за O(1); other становится пустой
+        if other is self or other.root is None:
+            return
+        self.root = other.root if self.root is None else self._link(self.root, other.root)
+        self.size += other.size
+        other.root = None
+        other.size = 0
+
+    @classmethod
+    def merge_all(cls, heaps: Iterable['PairingHeap']) -> 'PairingHeap':
+        # k-путевое слияние: корни сливаются попарно по кругу, всего k - 1 сравнений
+        result = cls()
+        roots: List[PairingNode] = []
+        for heap in heaps:
+            if heap.root is not None:
+                roots.append(heap.root)
+                result.size += heap.size
+                heap.root = None
+                heap.size = 0
+        while len(roots) > 1:
+            merged = [cls._link(roots[i], roots[i + 1]) for i in range(0, len(roots) - 1, 2)]
+            if len(roots) % 2:
+                merged.append(roots[-1])
+            roots = merged
+        result.root = roots[0] if roots else None
+        return result
+
+    def peek_max(self) -> Optional[Student]:
+        return self.root.student if self.root else None
+
+    def extract_max(self) -> Optional[Student]:
+        if self.root is None:
+            return None
+        max_student = self.root.student
+        self.root = self._merge_pairs(self.root.child)
+        self.size -= 1
+        return max_student
+
+    def _merge_pairs(self, node: Optional[PairingNode]) -> Optional[PairingNode]:
+        # Двухпроходное спаривание без рекурсии: сначала сливаем детей парами
+        # слева направо, затем объединяем пары справа налево
+        pairs: List[PairingNode] = []
+        while node is not None:
+            first = node
+            second = node.sibling
+            if second is None:
+                first.sibling = None
+                pairs.append(first)
+                break
+            node = second.sibling
+            first.sibling = None
+            second.sibling = None
+            pairs.append(self._link(first, second))
+        if not pairs:
+            return None
+        result = pairs.pop()
+        while pairs:
+            result = self._link(pairs.pop(), result)
+        return result
+
+    def search(self, average_grade: float) -> bool:
+        # Обход без рекурсии; поддеревья с меньшей оценкой в корне пропускаются
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            grade = node.student.average_grade
+            if grade == average_grade:
+                return True
+            if node.sibling:
+                stack.append(node.sibling)
+            if node.child and grade > average_grade:
+                stack.append(node.child)
+        return False
+
+    def save_to_file(self, filename: str) -> None:
+        with open(filename, 'w', encoding='utf-8') as f:
+            stack = [self.root] if self.root else []
+            while stack:
+                node = stack.pop()
+                student = node.student
+                f.write(f"{student.full_name},{student.group_number},{student.course},"
+                        f"{student.age},{student.average_grade}\n")
+                if node.sibling:
+                    stack.append(node.sibling)
+                if node.child:
+                    stack.append(node.child)
+
+    def load_from_file(self, filename: str) -> None:
+        self.extend(read_students(filename))
+
+def run_tests() -> None:
+    heap = PairingHeap()
+
+    # Тест 1: Вставка и поиск
+    heap.insert(Student("Иванов Иван", "Группа 1", 1, 18, 4.5))
+    heap.insert(Student("Петров Петр", "Группа 2", 2, 19, 3.5))
+    heap.insert(Student("Сидоров Сидор", "Группа 3", 3, 20, 4.0))
+    assert heap.search(4.5) == True
+    assert heap.search(3.5) == True
+    assert heap.search(5.0) == False
+
+    # Тест 2: Извлечение максимума
+    assert heap.extract_max().full_name == "Иванов Иван"
+    assert heap.extract_max().full_name == "Сидоров Сидор"
+    assert heap.size == 1
+
+    # Тест 3: Слияние двух куч
+    other = PairingHeap()
+    other.insert(Student("Смирнов Олег", "Группа 4", 1, 18, 4.8))
+    other.insert(Student("Козлов Антон", "Группа 4", 1, 18, 3.1))
+    heap.meld(other)
+    assert heap.size == 3 and other.size == 0 and other.extract_max() is None
+    assert [heap.extract_max().average_grade for _ in range(3)] == [4.8, 3.5, 3.1]
+
+    # Тест 4: k-путевое слияние сохраняет порядок извлечения
+    groups = []
+    grades = []
+    for g in range(7):
+        group = PairingHeap()
+        for i in range(g * 3):
+            grade = ((g * 31 + i * 17) % 50) / 10
+            group.insert(Student(f"Student {g}-{i}", f"Группа {g}", 1, 18, grade))
+            grades.append(grade)
+        groups.append(group)
+    merged = PairingHeap.merge_all(groups)
+    assert merged.size == len(grades)
+    assert all(group.size == 0 for group in groups)
+    assert [merged.extract_max().average_grade for _ in range(len(grades))] == sorted(grades, reverse=True)
+    assert PairingHeap.merge_all([]).size == 0
+
+    # Тест 5: Сохранение и загрузка
+    heap.extend(Student(f"Student {i}", "Группа 5", 2, 19, i / 4) for i in range(10))
+    heap.save_to_file('test_pairing.txt')
+    loaded = PairingHeap()
+    loaded.load_from_file('test_pairing.txt')
+    assert [loaded.extract_max().average_grade for _ in range(10)] == [i / 4 for i in range(9, -1, -1)]
+    os.remove('test_pairing.txt')
+
+def benchmark(groups: int = 100, per_group: int = 10000) -> None:
+    def make_group(g: int) -> List[Student]:
+        return [Student(f"Student {g}-{i}", f"Group {g}", (i % 4) + 1, 18 + (i % 5), ((g * 7919 + i * 31) % 1000) / 200)
+                for i in range(per_group)]
+
+    students = [make_group(g) for g in range(groups)]
+
+    # Текущий способ: извлекаем всё из куч групп и вставляем в общую MaxHeap
+    group_heaps = [MaxHeap.from_students(group) for group in students]
+    start_time = time.time()
+    faculty = MaxHeap()
+    for group_heap in group_heaps:
+        while group_heap.size:
+            faculty.insert(group_heap.extract_max())
+    print(f"MaxHeap extract/insert of {groups} x {per_group} students: {time.time() - start_time:.6f} seconds")
+
+    # Повторные insert в одну PairingHeap
+    start_time = time.time()
+    faculty_pairing = PairingHeap()
+    for group in students:
+        faculty_pairing.extend(group)
+    print(f"PairingHeap insert of {groups} x {per_group} students: {time.time() - start_time:.6f} seconds")
+
+    # Слияние готовых куч групп
+    pairing_groups = []
+    for group in students:
+        heap = PairingHeap()
+        heap.extend(group)
+        pairing_groups.append(heap)
+    start_time = time.time()
+    merged = PairingHeap.merge_all(pairing_groups)
+    print(f"PairingHeap merge_all of {groups} groups: {time.time() - start_time:.6f} seconds")
+
+    start_time = time.time()
+    for _ in range(per_group):
+        merged.extract_max()
+    print(f"PairingHeap extract {per_group} of {merged.size + per_group}: {time.time() - start_time:.6f} seconds")
+
+if __name__ == "__main__":
+    benchmark()
+    run_tests()
@@ -0,0 +1,278 @@
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from itertools import islice
+from operator import le
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+# Двоичный формат списка студентов, версия 1 (все числа little-endian):
+#   заголовок: магия b'STUR', версия (uint16), резерв (uint16),
+#              число студентов n (uint64), число строк в таблице m (uint64)
+#   столбцы:   average_grade float64[n], id ФИО uint32[n], id группы uint32[n],
+#              course int32[n], age int32[n]
+#   таблица строк: смещения uint64[m + 1] и следом байты всех строк в UTF-8
+# Все столбцы выровнены по своему размеру, поэтому после mmap их можно
+# читать через memoryview.cast без копирования
+MAGIC = b'STUR'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQQ')
+
+def write_roster(filename: str, students: Iterable[Any]) -> None:
+    grades = array('d')
+    name_ids = array('I')
+    group_ids = array('I')
+    courses = array('i')
+    ages = array('i')
+    string_ids: Dict[str, int] = {}
+    strings: List[bytes] = []
+
+    def string_id(value: str) -> int:
+        index = string_ids.get(value)
+        if index is None:
+            index = string_ids[value] = len(strings)
+            strings.append(value.encode('utf-8'))
+        return index
+
+    for student in students:
+        grades.append(student.average_grade)
+        name_ids.append(string_id(student.full_name))
+        group_ids.append(string_id(student.group_number))
+        courses.append(student.course)
+        ages.append(student.age)
+
+    offsets = array('Q', [0])
+    position = 0
+    for value in strings:
+        position += len(value)
+        offsets.append(position)
+
+    columns = (grades, name_ids, group_ids, courses, ages, offsets)
+    if sys.byteorder == 'big':
+        for column in columns:
+            column.byteswap()
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(grades), len(strings)))
+        for column in columns:
+            column.tofile(f)
+        f.write(b''.join(strings))
+
+class RosterFile:
+    # Файл, открытый через mmap: числовые столбцы доступны без копирования
+    # (grades[i], courses[i], ...), а объекты студентов создаются только при
+    # обращении roster[i] или при обходе
+    def __init__(self, filename: str, student_factory: Callable[..., Any]) -> None:
+        self.student_factory = student_factory
+        self.file = open(filename, 'rb')
+        try:
+            size = os.fstat(self.file.fileno()).st_size
+            # Пустой файл нельзя отобразить через mmap, а короткий не вмещает заголовок
+            if size < HEADER.size:
+                raise ValueError(f"{filename} не является двоичным файлом списка студентов")
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, count, string_count = HEADER.unpack_from(self.mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{filename} не является двоичным файлом списка студентов")
+            if version != VERSION:
+                raise ValueError(f"Неподдерживаемая версия формата: {version}")
+            if size < HEADER.size + 24 * count + 8 * (string_count + 1):
+                raise ValueError(f"Файл {filename} обрезан")
+        except BaseException:
+            if hasattr(self, 'mm'):
+                self.mm.close()
+            self.file.close()
+            raise
+
+        self.count = count
+        view = memoryview(self.mm)
+        position = HEADER.size
+        self.grades = self._column(view, position, 'd', count)
+        position += 8 * count
+        self.name_ids = self._column(view, position, 'I', count)
+        position += 4 * count
+        self.group_ids = self._column(view, position, 'I', count)
+        position += 4 * count
+        self.courses = self._column(view, position, 'i', count)
+        position += 4 * count
+        self.ages = self._column(view, position, 'i', count)
+        position += 4 * count
+        self.offsets = self._column(view, position, 'Q', string_count + 1)
+        strings_start = position + 8 * (string_count + 1)
+        self.strings = view[strings_start:]
+        self.view = view
+        self.string_count = string_count
+        self.string_cache: Dict[int, str] = {}
+        # Таблица строк: смещения не убывают и не выходят за конец файла.
+        # Номера строк у студентов проверяются при чтении (_decode)
+        offsets = self.offsets
+        if offsets[0] != 0 or size < strings_start + offsets[string_count] or \
+                not all(map(le, islice(offsets, string_count), islice(offsets, 1, None))):
+            self.close()
+            raise ValueError(f"Файл {filename} повреждён: неверная таблица строк")
+
+    @staticmethod
+    def _column(view: memoryview, position: int, typecode: str, count: int):
+        size = array(typecode).itemsize
+        column = view[position:position + size * count]
+        if sys.byteorder == 'big':
+            # На big-endian платформах без копирования не обойтись
+            copy = array(typecode, column.tobytes())
+            copy.byteswap()
+            return copy
+        return column.cast(typecode)
+
+    def _decode(self, index: int) -> str:
+        if index >= self.string_count:
+            raise ValueError(f"Номер строки {index} вне таблицы строк")
+        return str(self.strings[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+    def string(self, index: int) -> str:
+        # Строки декодируются по требованию; номера групп повторяются, поэтому кешируются
+        value = self.string_cache.get(index)
+        if value is None:
+            value = self.string_cache[index] = self._decode(index)
+        return value
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Any:
+        if not 0 <= index < self.count:
+            raise IndexError("Номер студента вне диапазона")
+        return self.student_factory(self._decode(self.name_ids[index]), self.string(self.group_ids[index]),
+                                    self.courses[index], self.ages[index], self.grades[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(self.count):
+            yield self[index]
+
+    def is_sorted(self) -> bool:
+        grades = self.grades
+        return all(grades[i] <= grades[i + 1] for i in range(self.count - 1))
+
+    def close(self) -> None:
+        # memoryview нужно освободить до закрытия mmap
+        for name in ('grades', 'name_ids', 'group_ids', 'courses', 'ages', 'offsets', 'strings', 'view'):
+            column = self.__dict__.pop(name, None)
+            if isinstance(column, memoryview):
+                column.release()
+        self.string_cache = {}
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self) -> 'RosterFile':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def run_tests() -> None:
+    from avltree import AVLTree
+    from kucha import MaxHeap, Student
+
+    students = [Student(f"Студент {i}", f"Группа {i % 3}", 1 + i % 4, 18 + i % 5, ((i * 37) % 101) / 20)
+                for i in range(50)]
+
+    # Тест 1: Запись и чтение без потерь
+    write_roster('test_roster.bin', students)
+    try:
+        with RosterFile('test_roster.bin', Student) as roster:
+            assert len(roster) == 50
+            assert roster.grades[7] == students[7].average_grade and roster.courses[7] == students[7].course
+            loaded = list(roster)
+            assert [(s.full_name, s.group_number, s.course, s.age, s.average_grade) for s in loaded] == \
+                [(s.full_name, s.group_number, s.course, s.age, s.average_grade) for s in students]
+            assert roster.is_sorted() == False
+            try:
+                roster[50]
+                assert False, "Ожидалась ошибка IndexError"
+            except IndexError:
+                pass
+
+        # Тест 2: Пустой список и чужой файл
+        write_roster('test_roster.bin', [])
+        with RosterFile('test_roster.bin', Student) as roster:
+            assert len(roster) == 0 and list(roster) == []
+        # Чужой, пустой, короче заголовка, обрезанный в столбцах и в таблице строк,
+        # с убывающими смещениями строк
+        write_roster('test_roster.bin', students)
+        with open('test_roster.bin', 'rb') as f:
+            data = f.read()
+        strings_start = HEADER.size + 24 * len(students) + 8 * (len(students) + 3 + 1)
+        broken = bytearray(data)
+        broken[strings_start - 16:strings_start - 8] = struct.pack('<Q', 10 ** 6)
+        for data in (b'not a roster at all, really', b'', b'STUR', data[:HEADER.size + 100], data[:-20],
+                     bytes(broken)):
+            with open('test_roster.bin', 'wb') as f:
+                f.write(data)
+            try:
+                RosterFile('test_roster.bin', Student)
+                assert False, "Ожидалась ошибка ValueError"
+            except ValueError:
+                pass
+
+        # Тест 3: Сохранение и загрузка обеих структур
+        heap = MaxHeap.from_students(students)
+        heap.save_binary('test_roster.bin')
+        heap = MaxHeap()
+        heap.load_binary('test_roster.bin')
+        assert [heap.extract_max().average_grade for _ in range(50)] == \
+            sorted((s.average_grade for s in students), reverse=True)
+
+        tree = AVLTree()
+        for student in students:
+            tree.insert(student)
+        tree.save_binary('test_roster.bin')
+        with RosterFile('test_roster.bin', Student) as roster:
+            assert roster.is_sorted() == True
+        tree = AVLTree()
+        tree.load_binary('test_roster.bin')
+        assert len(tree) == 50
+        assert [s.average_grade for s in tree.iter_range(-1.0, 10.0)] == sorted(s.average_grade for s in students)
+    finally:
+        os.remove('test_roster.bin')
+
+def benchmark(n: int = 10 ** 6) -> None:
+    from avltree import AVLTree
+    from kucha import MaxHeap, Student
+
+    heap = MaxHeap.from_students(Student(f"Student {i}", f"Group {i % 100}", (i % 4) + 1, 18 + (i % 5),
+                                         ((i * 7919) % 1000) / 200) for i in range(n))
+    try:
+        for name, save, load in (("CSV", heap.save_to_file, MaxHeap.load_from_file),
+                                 ("binary", heap.save_binary, MaxHeap.load_binary)):
+            filename = f"benchmark_roster.{name.lower()}"
+            start_time = time.time()
+            save(filename)
+            print(f"{name}: save {n} students in {time.time() - start_time:.6f} seconds, "
+                  f"{os.path.getsize(filename) / n:.1f} bytes per student")
+            start_time = time.time()
+            load(MaxHeap(), filename)
+            print(f"{name}: load {n} students into MaxHeap in {time.time() - start_time:.6f} seconds")
+
+        tree = AVLTree.from_sorted(sorted(heap.heap, key=lambda s: s.average_grade))
+        tree.save_to_file('benchmark_roster.csv', order='inorder')
+        tree.save_binary('benchmark_roster.binary')
+        start_time = time.time()
+        AVLTree().load_from_file('benchmark_roster.csv')
+        print(f"CSV: load {n} students into AVLTree in {time.time() - start_time:.6f} seconds")
+        start_time = time.time()
+        AVLTree().load_binary('benchmark_roster.binary')
+        print(f"binary: load {n} students into AVLTree in {time.time() - start_time:.6f} seconds")
+
+        # Доступ к одному столбцу без создания объектов студентов
+        start_time = time.time()
+        with RosterFile('benchmark_roster.binary', Student) as roster:
+            best = max(roster.grades)
+        print(f"binary: max grade over {n} students via mmap column in {time.time() - start_time:.6f} seconds "
+              f"({best})")
+    finally:
+        for filename in ('benchmark_roster.csv', 'benchmark_roster.binary'):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+if __name__ == "__main__":
+    benchmark()
+    run_tests()
@@ -0,0 +1,192 @@
+import math
+import time
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from avltree import AVLTree
+from indexed_heap import StudentKey, student_key
+from kucha import Student
+
+class StudentTable:
+    # Каждый студент хранится один раз (по ключу ФИО + группа), а вторичные
+    # индексы ссылаются на тот же объект:
+    #   - AVL-дерево по средней оценке (упорядоченный, умеет считать диапазоны);
+    #   - хеш по номеру группы;
+    #   - составной индекс по (курс, возраст): курс -> возраст -> студенты, поэтому
+    #     условие только на курс использует его как префикс
+    def __init__(self) -> None:
+        self.rows: Dict[StudentKey, Student] = {}
+        self.grade_index = AVLTree()
+        self.group_index: Dict[str, Dict[StudentKey, Student]] = {}
+        self.course_age_index: Dict[int, Dict[int, Dict[StudentKey, Student]]] = {}
+        self.course_counts: Dict[int, int] = {}  # число студентов на курсе для explain
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Student]:
+        return iter(self.rows.values())
+
+    def get(self, key: StudentKey) -> Optional[Student]:
+        return self.rows.get(key)
+
+    def insert(self, student: Student) -> None:
+        key = student_key(student)
+        if key in self.rows:
+            raise KeyError(f"Студент {key} уже есть в таблице")
+        self.rows[key] = student
+        self.grade_index.insert(student)
+        self.group_index.setdefault(student.group_number, {})[key] = student
+        self.course_age_index.setdefault(student.course, {}).setdefault(student.age, {})[key] = student
+        self.course_counts[student.course] = self.course_counts.get(student.course, 0) + 1
+
+    def delete(self, key: StudentKey) -> Optional[Student]:
+        student = self.rows.pop(key, None)
+        if student is None:
+            return None
+        self.grade_index.remove(student)
+        self._discard(self.group_index, student.group_number, key)
+        ages = self.course_age_index[student.course]
+        self._discard(ages, student.age, key)
+        if ages:
+            self.course_counts[student.course] -= 1
+        else:
+            del self.course_age_index[student.course]
+            del self.course_counts[student.course]
+        return student
+
+    @staticmethod
+    def _discard(index: dict, value, key: StudentKey) -> None:
+        bucket = index[value]
+        del bucket[key]
+        if not bucket:
+            del index[value]
+
+    def explain(self, min_grade: Optional[float] = None, max_grade: Optional[float] = None,
+                group_number: Optional[str] = None, course: Optional[int] = None,
+                age: Optional[int] = None) -> Tuple[str, int]:
+        # Выбор самого избирательного индекса: для каждого применимого индекса
+        # число кандидатов известно заранее (размер корзины хеша или
+        # count_range у AVL-дерева за O(log n))
+        plans = [('scan', len(self.rows))]
+        if min_grade is not None or max_grade is not None:
+            lo = -math.inf if min_grade is None else min_grade
+            hi = math.inf if max_grade is None else max_grade
+            plans.append(('grade', self.grade_index.count_range(lo, hi)))
+        if group_number is not None:
+            plans.append(('group', len(self.group_index.get(group_number, ()))))
+        if course is not None and age is not None:
+            plans.append(('course_age', len(self.course_age_index.get(course, {}).get(age, ()))))
+        elif course is not None:
+            plans.append(('course', self.course_counts.get(course, 0)))
+        return min(plans, key=lambda plan: plan[1])
+
+    def query(self, min_grade: Optional[float] = None, max_grade: Optional[float] = None,
+              group_number: Optional[str] = None, course: Optional[int] = None,
+              age: Optional[int] = None) -> List[Student]:
+        # Все условия объединяются по "и"; кандидатов даёт выбранный индекс,
+        # остальные условия проверяются по самим записям
+        plan, _ = self.explain(min_grade, max_grade, group_number, course, age)
+        if plan == 'grade':
+            lo = -math.inf if min_grade is None else min_grade
+            hi = math.inf if max_grade is None else max_grade
+            candidates = self.grade_index.iter_range(lo, hi)
+        elif plan == 'group':
+            candidates = self.group_index.get(group_number, {}).values()
+        elif plan == 'course_age':
+            candidates = self.course_age_index.get(course, {}).get(age, {}).values()
+        elif plan == 'course':
+            candidates = chain.from_iterable(bucket.values()
+                                             for bucket in self.course_age_index.get(course, {}).values())
+        else:
+            candidates = self.rows.values()
+        return [student for student in candidates
+                if (min_grade is None or student.average_grade >= min_grade)
+                and (max_grade is None or student.average_grade <= max_grade)
+                and (group_number is None or student.group_number == group_number)
+                and (course is None or student.course == course)
+                and (age is None or student.age == age)]
+
+def run_tests() -> None:
+    table = StudentTable()
+    students = [Student(f"Студент {i}", f"Группа {i % 7}", 1 + i % 4, 18 + i % 5, ((i * 37) % 101) / 20)
+                for i in range(300)]
+    for student in students:
+        table.insert(student)
+
+    def expected(predicate) -> List[str]:
+        return sorted(s.full_name for s in table if predicate(s))
+
+    # Тест 1: Повторная вставка запрещена
+    try:
+        table.insert(Student("Студент 0", "Группа 0", 1, 18, 5.0))
+        assert False, "Ожидалась ошибка KeyError"
+    except KeyError:
+        pass
+
+    # Тест 2: Выбор индекса
+    assert table.explain(group_number="Группа 3")[0] == 'group'
+    assert table.explain(course=2, age=19) == ('course_age', sum(1 for s in students if (s.course, s.age) == (2, 19)))
+    assert table.explain(min_grade=4.9, group_number="Группа 3")[0] == 'grade'
+    assert table.explain(course=2) == ('course', sum(1 for s in students if s.course == 2))
+    assert table.explain(age=19)[0] == 'scan'
+    assert table.explain(course=7) == ('course', 0)
+
+    # Тест 3: Результаты совпадают с полным перебором
+    result = table.query(min_grade=2.0, max_grade=3.0, group_number="Группа 1")
+    assert sorted(s.full_name for s in result) == \
+        expected(lambda s: 2.0 <= s.average_grade <= 3.0 and s.group_number == "Группа 1")
+    result = table.query(course=3, age=20, max_grade=4.0)
+    assert sorted(s.full_name for s in result) == \
+        expected(lambda s: s.course == 3 and s.age == 20 and s.average_grade <= 4.0)
+    assert sorted(s.full_name for s in table.query(course=4)) == expected(lambda s: s.course == 4)
+    assert sorted(s.full_name for s in table.query(course=1, min_grade=2.5)) == \
+        expected(lambda s: s.course == 1 and s.average_grade >= 2.5)
+    assert table.query(course=7) == []
+    assert len(table.query()) == 300
+
+    # Тест 4: Удаление поддерживает все индексы
+    for i in range(0, 300, 2):
+        assert table.delete((f"Студент {i}", f"Группа {i % 7}")) is students[i]
+    assert table.delete(("Студент 0", "Группа 0")) is None
+    assert len(table) == 150 and len(table.grade_index) == 150
+    assert sum(len(bucket) for bucket in table.group_index.values()) == 150
+    assert sum(len(bucket) for ages in table.course_age_index.values() for bucket in ages.values()) == 150
+    assert sum(table.course_counts.values()) == 150
+    assert sorted(s.full_name for s in table.query(course=2)) == expected(lambda s: s.course == 2)
+    result = table.query(min_grade=1.0, max_grade=4.5, group_number="Группа 2")
+    assert sorted(s.full_name for s in result) == \
+        expected(lambda s: 1.0 <= s.average_grade <= 4.5 and s.group_number == "Группа 2")
+    for i in range(1, 300, 2):
+        table.delete((f"Студент {i}", f"Группа {i % 7}"))
+    assert table.course_age_index == {} and table.course_counts == {}
+
+def benchmark(n: int = 10 ** 5, queries: int = 1000) -> None:
+    table = StudentTable()
+    start_time = time.time()
+    for i in range(n):
+        table.insert(Student(f"Student {i}", f"Group {i % 500}", (i % 4) + 1, 18 + (i % 7),
+                             ((i * 7919) % 1000) / 200))
+    print(f"Time to insert {n} students into StudentTable: {time.time() - start_time:.6f} seconds")
+
+    start_time = time.time()
+    for q in range(queries):
+        table.query(min_grade=3.0, group_number=f"Group {q % 500}", course=(q % 4) + 1)
+    print(f"Time for {queries} indexed queries: {time.time() - start_time:.6f} seconds")
+
+    start_time = time.time()
+    for q in range(queries // 100):
+        [s for s in table if s.average_grade >= 3.0 and s.group_number == f"Group {q % 500}"
+         and s.course == (q % 4) + 1]
+    print(f"Time for {queries // 100} full scans: {time.time() - start_time:.6f} seconds")
+
+    # Условие только на курс: курс берётся как префикс составного индекса
+    start_time = time.time()
+    for q in range(queries // 100):
+        table.query(course=(q % 4) + 1)
+    print(f"Time for {queries // 100} course-only queries ({table.explain(course=1)[0]} plan): "
+          f"{time.time() - start_time:.6f} seconds")
+
+if __name__ == "__main__":
+    benchmark()
+    run_tests()
@@ -0,0 +1,150 @@
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from operator import attrgetter
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from kucha import READ_CHUNK_SIZE, MaxHeap, Student, parse_students, read_students
+
+grade_key = attrgetter('average_grade')
+
+def top_k(source: Union[str, Iterable[Student]], k: int, key: Callable[[Student], float] = grade_key,
+          workers: int = 1, chunk_size: int = READ_CHUNK_SIZE) -> List[Student]:
+    # k лучших студентов по убыванию key; файл читается лениво, в памяти
+    # держится только куча из k элементов. При workers > 1 файл делится на
+    # диапазоны байтов, которые обрабатываются в отдельных процессах
+    # (key в этом случае должен сериализоваться pickle, лямбды не подойдут)
+    return _select(source, k, key, workers, chunk_size, largest=True)
+
+def bottom_k(source: Union[str, Iterable[Student]], k: int, key: Callable[[Student], float] = grade_key,
+             workers: int = 1, chunk_size: int = READ_CHUNK_SIZE) -> List[Student]:
+    # k худших студентов по возрастанию key
+    return _select(source, k, key, workers, chunk_size, largest=False)
+
+def _select(source: Union[str, Iterable[Student]], k: int, key: Callable[[Student], float],
+            workers: int, chunk_size: int, largest: bool) -> List[Student]:
+    if k <= 0:
+        return []
+    pick = heapq.nlargest if largest else heapq.nsmallest
+    if not isinstance(source, str):
+        return pick(k, source, key=key)
+    if workers <= 1:
+        return pick(k, read_students(source, chunk_size), key=key)
+
+    ranges = _split_ranges(source, workers)
+    tasks = [(source, start, end, k, key, chunk_size, largest) for start, end in ranges]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_select_range, tasks))
+    # Диапазоны идут в порядке файла, поэтому при равных ключах порядок
+    # совпадает с последовательным режимом
+    return pick(k, chain.from_iterable(results), key=key)
+
+def _split_ranges(filename: str, parts: int) -> List[Tuple[int, int]]:
+    file_size = os.path.getsize(filename)
+    step = max(file_size // parts, 1)
+    bounds = list(range(0, file_size, step))[:parts] + [file_size]
+    return list(zip(bounds, bounds[1:]))
+
+def _select_range(task: Tuple[str, int, int, int, Callable[[Student], float], int, bool]) -> List[Student]:
+    filename, start, end, k, key, chunk_size, largest = task
+    pick = heapq.nlargest if largest else heapq.nsmallest
+    return pick(k, read_students_range(filename, start, end, chunk_size), key=key)
+
+def read_students_range(filename: str, start: int, end: int,
+                        chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Student]:
+    # Строка относится к тому диапазону, в который попал её первый байт
+    with open(filename, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        tail = b''
+        while position < end:
+            chunk = f.read(min(chunk_size, end - position))
+            if not chunk:
+                break
+            position += len(chunk)
+            chunk = tail + chunk
+            if position >= end:
+                # Дочитываем строку, пересекающую конец диапазона
+                if not chunk.endswith(b'\n'):
+                    chunk += f.readline()
+                tail = b''
+            else:
+                cut = chunk.rfind(b'\n') + 1
+                chunk, tail = chunk[:cut], chunk[cut:]
+            text = chunk.decode('utf-8').strip()
+            if text:
+                yield from parse_students(text)
+        text = tail.decode('utf-8').strip()
+        if text:
+            yield from parse_students(text)
+
+def run_tests() -> None:
+    grades = [3.7, 4.9, 2.5, 4.1, 4.9, 3.0, 5.0, 3.3, 4.4, 2.8, 4.0, 3.9]
+    students = [Student(f"Студент {i}", f"Группа {i % 3}", 1 + i % 4, 18 + i % 5, grade)
+                for i, grade in enumerate(grades)]
+
+    # Тест 1: Выбор из итерируемого объекта
+    assert [s.average_grade for s in top_k(students, 3)] == [5.0, 4.9, 4.9]
+    assert [s.average_grade for s in bottom_k(students, 2)] == [2.5, 2.8]
+    assert top_k(students, 0) == []
+    assert len(top_k(students, 100)) == len(students)
+
+    # Тест 2: Произвольный ключ
+    oldest = top_k(students, 1, key=attrgetter('age'))
+    assert oldest[0].age == 22
+
+    # Тест 3: Чтение из файла, последовательно и по диапазонам байтов
+    MaxHeap.from_students(students).save_to_file('test_topk.txt')
+    try:
+        expected = [s.full_name for s in top_k(students, 5)]
+        assert [s.full_name for s in top_k('test_topk.txt', 5)] == expected
+        assert [s.full_name for s in top_k('test_topk.txt', 5, chunk_size=16)] == expected
+        assert [s.full_name for s in top_k('test_topk.txt', 5, workers=3)] == expected
+        assert [s.full_name for s in bottom_k('test_topk.txt', 4, workers=4)] == \
+            [s.full_name for s in bottom_k(students, 4)]
+
+        # Тест 4: Диапазоны покрывают каждую строку ровно один раз
+        file_size = os.path.getsize('test_topk.txt')
+        for parts in (1, 2, 5, 40):
+            names = []
+            for start, end in _split_ranges('test_topk.txt', parts):
+                names.extend(s.full_name for s in read_students_range('test_topk.txt', start, end, chunk_size=8))
+            assert sorted(names) == sorted(s.full_name for s in students)
+        assert _split_ranges('test_topk.txt', 1) == [(0, file_size)]
+    finally:
+        os.remove('test_topk.txt')
+
+def benchmark(n: int = 10 ** 6, k: int = 100, workers: Optional[int] = None) -> None:
+    workers = workers or os.cpu_count() or 1
+    filename = 'benchmark_topk.txt'
+    students = (Student(f"Student {i}", f"Group {i % 100}", (i % 4) + 1, 18 + (i % 5), (i * 7919) % 1000 / 200)
+                for i in range(n))
+    with open(filename, 'w', encoding='utf-8') as f:
+        for student in students:
+            f.write(f"{student.full_name},{student.group_number},{student.course},"
+                    f"{student.age},{student.average_grade}\n")
+    try:
+        start_time = time.time()
+        heap = MaxHeap()
+        heap.load_from_file(filename)
+        for _ in range(k):
+            heap.extract_max()
+        print(f"MaxHeap load + {k} x extract_max over {n} rows: {time.time() - start_time:.6f} seconds")
+
+        start_time = time.time()
+        top_k(filename, k)
+        print(f"Streaming top_k({k}) over {n} rows: {time.time() - start_time:.6f} seconds")
+
+        start_time = time.time()
+        top_k(filename, k, workers=workers)
+        print(f"Parallel top_k({k}) over {n} rows, {workers} workers: {time.time() - start_time:.6f} seconds")
+    finally:
+        os.remove(filename)
+
+if __name__ == "__main__":
+    benchmark()
+    run_tests()
@@ -0,0 +1,299 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy - необязательная зависимость, нужна только этому модулю
+    np = None
+
+from lab41 import BOOK_FIELDS, Book, BookArray
+
+# Поля, которые хранятся числовыми массивами и сравниваются без перекодирования
+NUMERIC_FIELDS = ('pages', 'price')
+# Книги превращаются в объекты Book пачками такого размера
+ITER_CHUNK_SIZE = 4096
+
+# Каталог книг "по столбцам": каждое поле - отдельный массив numpy (pages - int64,
+# price - float64, isbn - байтовые строки фиксированной ширины, автор - массив
+# объектов, издательство - коды int32 в словаре названий: издательств мало).
+# Сортировка строит перестановку через np.lexsort, фильтры - булевы маски;
+# объекты Book создаются только при обходе
+class ColumnarBookArray:
+    def __init__(self, capacity: int = 16) -> None:
+        if np is None:
+            raise ImportError("Для ColumnarBookArray нужен пакет numpy")
+        self.size = 0
+        self.author = np.empty(capacity, dtype=object)
+        self.publisher = np.empty(capacity, dtype=np.int32)
+        self.publisher_names: List[str] = []
+        self.publisher_codes: Dict[str, int] = {}
+        self.pages = np.empty(capacity, dtype=np.int64)
+        self.price = np.empty(capacity, dtype=np.float64)
+        self.isbn = np.empty(capacity, dtype='S16')
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f"[{', '.join(str(book) for book in self)}]"
+
+    def __str__(self) -> str:
+        return '\n'.join(str(book) for book in self)
+
+    # Метод для добавления книги; массивы растут удвоением
+    def append(self, book: Book) -> None:
+        self._reserve(self.size + 1)
+        isbn = book.isbn.encode('utf-8')
+        self._fit_isbn(len(isbn))
+        i = self.size
+        self.author[i] = book.author
+        self.publisher[i] = self._publisher_code(book.publisher)
+        self.pages[i] = book.pages
+        self.price[i] = book.price
+        self.isbn[i] = isbn
+        self.size += 1
+
+    # Метод для добавления многих книг одной записью в каждый столбец
+    def extend(self, books: Iterable[Book]) -> None:
+        books = list(books)
+        if not books:
+            return
+        start, end = self.size, self.size + len(books)
+        self._reserve(end)
+        isbns = np.array([book.isbn.encode('utf-8') for book in books])
+        self._fit_isbn(isbns.dtype.itemsize)
+        self.author[start:end] = [book.author for book in books]
+        self.publisher[start:end] = [self._publisher_code(book.publisher) for book in books]
+        self.pages[start:end] = [book.pages for book in books]
+        self.price[start:end] = [book.price for book in books]
+        self.isbn[start:end] = isbns
+        self.size = end
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= len(self.price):
+            return
+        capacity = max(capacity, 2 * len(self.price))
+        for field in BOOK_FIELDS:
+            column = getattr(self, field)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, field, grown)
+
+    def _publisher_code(self, publisher: str) -> int:
+        code = self.publisher_codes.get(publisher)
+        if code is None:
+            code = self.publisher_codes[publisher] = len(self.publisher_names)
+            self.publisher_names.append(publisher)
+        return code
+
+    def _fit_isbn(self, width: int) -> None:
+        # При записи в массив фиксированной ширины длинная строка обрезалась бы
+        if width > self.isbn.dtype.itemsize:
+            self.isbn = self.isbn.astype(f'S{width}')
+
+    # Метод для удаления книг по ISBN
+    def delete(self, isbn: str) -> None:
+        self._keep(self.isbn[:self.size] != isbn.encode('utf-8'))
+
+    # Метод для удаления книг с любым из ISBN одной маской. Маска строится
+    # проверкой по множеству: np.isin для строк сортирует весь столбец
+    def delete_many(self, isbns: Iterable[str]) -> int:
+        targets = {isbn.encode('utf-8') for isbn in isbns}
+        if not targets:
+            return 0
+        mask = np.fromiter((isbn not in targets for isbn in self.isbn[:self.size].tolist()),
+                           dtype=bool, count=self.size)
+        return self._keep(mask)
+
+    def _keep(self, mask: 'np.ndarray') -> int:
+        kept = int(np.count_nonzero(mask))
+        removed = self.size - kept
+        if removed:
+            for field in BOOK_FIELDS:
+                column = getattr(self, field)
+                column[:kept] = column[:self.size][mask]
+                if column.dtype == object:
+                    column[kept:self.size] = None
+            self.size = kept
+        return removed
+
+    # Сортировка по полям с тем же описанием ключа, что и у BookArray.sort
+    # ("price", "-price", ("publisher", "-price")); устойчивая, как np.lexsort
+    def sort(self, key: Union[str, Sequence[str]], reverse: bool = False) -> None:
+        specs = [key] if isinstance(key, str) else list(key)
+        sort_keys = []
+        for spec in specs:
+            if not isinstance(spec, str):
+                raise TypeError("ColumnarBookArray сортируется только по именам полей")
+            descending = spec.startswith('-') != reverse
+            field = spec.lstrip('-')
+            if field not in BOOK_FIELDS:
+                raise ValueError(f"Неизвестное поле книги: {field}")
+            column = getattr(self, field)[:self.size]
+            if field == 'publisher':
+                # Код издательства заменяется его местом среди отсортированных названий
+                ranks = np.empty(len(self.publisher_names), dtype=np.int64)
+                ranks[sorted(range(len(ranks)), key=self.publisher_names.__getitem__)] = np.arange(len(ranks))
+                column = ranks[column]
+            elif field not in NUMERIC_FIELDS:
+                # Строки заменяются номерами в отсортированном словаре значений
+                column = np.unique(column, return_inverse=True)[1]
+            sort_keys.append(-column if descending else column)
+        # В np.lexsort главный ключ - последний
+        self._permute(np.lexsort(sort_keys[::-1]))
+
+    def _permute(self, order: 'np.ndarray') -> None:
+        for field in BOOK_FIELDS:
+            column = getattr(self, field)
+            column[:self.size] = column[:self.size][order]
+
+    # Фильтр по диапазонам цены и числа страниц (границы включаются); возвращает новый каталог
+    def filter(self, min_price: Optional[float] = None, max_price: Optional[float] = None,
+               min_pages: Optional[int] = None, max_pages: Optional[int] = None) -> 'ColumnarBookArray':
+        price = self.price[:self.size]
+        pages = self.pages[:self.size]
+        mask = np.ones(self.size, dtype=bool)
+        if min_price is not None:
+            mask &= price >= min_price
+        if max_price is not None:
+            mask &= price <= max_price
+        if min_pages is not None:
+            mask &= pages >= min_pages
+        if max_pages is not None:
+            mask &= pages <= max_pages
+        result = ColumnarBookArray(0)
+        result.publisher_names = list(self.publisher_names)
+        result.publisher_codes = dict(self.publisher_codes)
+        for field in BOOK_FIELDS:
+            setattr(result, field, getattr(self, field)[:self.size][mask])
+        result.size = len(result.price)
+        return result
+
+    def __getitem__(self, index: int) -> Book:
+        if not 0 <= index < self.size:
+            raise IndexError("Номер книги вне диапазона")
+        return Book(self.author[index], self.publisher_names[self.publisher[index]], int(self.pages[index]),
+                    float(self.price[index]), self.isbn[index].decode('utf-8'))
+
+    # Делает класс итерируемым: объекты Book создаются пачками по мере обхода
+    def __iter__(self) -> Iterator[Book]:
+        names = self.publisher_names
+        for start in range(0, self.size, ITER_CHUNK_SIZE):
+            end = min(start + ITER_CHUNK_SIZE, self.size)
+            for author, publisher, pages, price, isbn in zip(
+                    self.author[start:end].tolist(), self.publisher[start:end].tolist(),
+                    self.pages[start:end].tolist(), self.price[start:end].tolist(),
+                    self.isbn[start:end].tolist()):
+                yield Book(author, names[publisher], pages, price, isbn.decode('utf-8'))
+
+# Функция для тестирования класса ColumnarBookArray
+def tests_array() -> None:
+    print("\nТесты:")
+    books = [
+        Book("Джек Лондон", "Эксмо", 323, 699.99, "7-1343-16"),
+        Book("Макс Фрай", "Эксмо", 687, 450.0, "4-4551-18"),
+        Book("Владимир Торин", "Миф", 767, 899.0, "1-145-17"),
+        Book("Джон Мильтон", "АСТ", 445, 399.99, "6-4166-815"),
+        Book("Уильям Индик", "Миф", 380, 500.0, "5-51-1998"),
+        Book("Кэролайн О`Дохонью", "LikeBook", 365, 799.0, "2-190-10"),
+        Book("Лия Арден", "Эксмо", 414, 1280.0, "8-21-3145"),
+        Book("Михаил Булгаков", "Азбука", 1114, 1349.0, "9-5631-156"),
+        Book("Гастон Леру", "Эксмо", 317, 320.0, "3-1342-2413"),
+        Book("Бернар Вербер", "Эксмо", 412, 699.99, "8-3165-3614")
+    ]
+
+    def rows(array) -> list:
+        return [(book.author, book.publisher, book.pages, book.price, book.isbn) for book in array]
+
+    # Тест 1. Добавление по одной книге и пачкой, обход создаёт те же книги
+    arr = ColumnarBookArray(2)
+    for book in books[:4]:
+        arr.append(book)
+    arr.extend(books[4:])
+    arr.append(Book("Автор", "Издательство", 100, 1.0, "978-5-17-118366-2"))
+    assert len(arr) == 11 and rows(arr)[:10] == rows(books)
+    assert arr[10].isbn == "978-5-17-118366-2"
+    arr.delete("978-5-17-118366-2")
+    print(f"ColumnarBookArray после добавления элементов:\n{arr}")
+
+    # Тест 2. Сортировки совпадают с BookArray.sort (включая порядок равных)
+    reference = BookArray()
+    for book in books:
+        reference.append(book)
+    for key, reverse in (("price", False), ("-pages", False), ("isbn", True), (("publisher", "-price"), False),
+                         (("-publisher", "author"), True)):
+        arr.sort(key, reverse=reverse)
+        reference.sort(key, reverse=reverse)
+        assert rows(arr) == rows(reference), key
+    print(f"\nColumnarBookArray после сортировки по издательству и убыванию цены:\n{arr}")
+
+    # Тест 3. Фильтры по маске
+    cheap = arr.filter(max_price=500.0, min_pages=350)
+    assert sorted(book.isbn for book in cheap) == \
+        sorted(book.isbn for book in books if book.price <= 500.0 and book.pages >= 350)
+    assert len(arr.filter()) == 10 and len(arr.filter(min_price=2000.0)) == 0
+
+    # Тест 4. Удаление
+    arr.delete("2-190-10")
+    assert arr.delete_many(["7-1343-16", "1-145-17", "0-000-00"]) == 2
+    assert len(arr) == 7 and all(book.isbn not in ("2-190-10", "7-1343-16", "1-145-17") for book in arr)
+    try:
+        arr.sort(lambda book: book.price)
+        assert False, "Ожидалась ошибка TypeError"
+    except TypeError:
+        pass
+    print("Все тесты пройдены!")
+
+# Функция для выполнения бенчмарков
+def benchmarks(n: int = 1000000) -> None:
+    print("\nБенчмарки")
+    books = [Book(f'Author{i}', f'Publisher{i % 100}', i % 1000 + 100, (i * 7919) % 100000 / 100, f'ISBN{i:07d}')
+             for i in range(n)]
+
+    arr = BookArray()
+    start = time.time()
+    for book in books:
+        arr.append(book)
+    end = time.time()
+    print(f"BookArray: добавление {n} элементов: {(end - start):.5f} секунд")
+    columnar = ColumnarBookArray()
+    start = time.time()
+    columnar.extend(books)
+    end = time.time()
+    print(f"ColumnarBookArray: добавление {n} элементов: {(end - start):.5f} секунд")
+
+    for key in ("price", ("publisher", "-price")):
+        for name, array in (("BookArray", arr), ("ColumnarBookArray", columnar)):
+            start = time.time()
+            array.sort(key)
+            end = time.time()
+            print(f"{name}: сортировка по {key} для {n} элементов: {(end - start):.5f} секунд")
+
+    start = time.time()
+    selected = [book for book in arr if 200.0 <= book.price <= 300.0 and book.pages >= 500]
+    end = time.time()
+    print(f"BookArray: фильтр по цене и страницам ({len(selected)} книг): {(end - start):.5f} секунд")
+    start = time.time()
+    selected = columnar.filter(min_price=200.0, max_price=300.0, min_pages=500)
+    end = time.time()
+    print(f"ColumnarBookArray: фильтр по цене и страницам ({len(selected)} книг): {(end - start):.5f} секунд")
+
+    isbns = [f'ISBN{i:07d}' for i in range(0, n, 100)]
+    for name, array in (("BookArray", arr), ("ColumnarBookArray", columnar)):
+        start = time.time()
+        array.delete_many(isbns)
+        end = time.time()
+        print(f"{name}: удаление {len(isbns)} элементов: {(end - start):.5f} секунд")
+
+    start = time.time()
+    total = sum(book.price for book in columnar)
+    end = time.time()
+    print(f"ColumnarBookArray: обход с созданием Book ({total:.0f}): {(end - start):.5f} секунд")
+
+# Запуск тестов и бенчмарков
+if __name__ == "__main__":
+    if np is None:
+        print("numpy не установлен, ColumnarBookArray недоступен")
+    else:
+        tests_array()
+        benchmarks()
@@ -0,0 +1,290 @@
+import heapq
+import io
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import repeat
+from operator import attrgetter, itemgetter
+from sys import getsizeof
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from lab41 import BOOK_FIELDS, Book, BookArray, SortKey
+
+# Формат файла книг: по строке на книгу, поля через запятую в порядке
+# автор, издательство, количество страниц, стоимость, ISBN (UTF-8)
+
+# Сколько байт из начала файла разбирается, чтобы измерить, во сколько раз блок
+# вырастает в памяти (не больше 1/64 бюджета памяти)
+MEMORY_SAMPLE = 1 << 16
+# Буферы открытого текстового файла: байтовый и декодированный
+FILE_BUFFER_BYTES = 2 * io.DEFAULT_BUFFER_SIZE
+# Сколько файлов-серий сливается за один проход (не больше, чем позволяет бюджет памяти)
+MERGE_FAN_IN = 64
+# Наименьший блок, которым при слиянии читается каждая серия
+MIN_MERGE_READ = 4096
+
+def _split_fields(text: str) -> List[str]:
+    # Поля всех строк блока одним списком. Запятые считаются в каждой строке:
+    # проверка только общего числа полей пропустила бы строку с лишним полем
+    # рядом со строкой без поля, и все поля между ними сдвинулись бы
+    lines = text.rstrip('\n').split('\n')
+    if set(map(str.count, lines, repeat(','))) != {4}:
+        raise ValueError("Некорректный формат файла: ожидается 5 полей в строке")
+    return ','.join(lines).split(',')
+
+def parse_books(text: str) -> List[Book]:
+    # Весь блок разбирается одним split: каждое поле берётся срезом с шагом 5
+    fields = _split_fields(text)
+    return list(map(Book, fields[0::5], fields[1::5], map(int, fields[2::5]), map(float, fields[3::5]),
+                    fields[4::5]))
+
+def format_books(books: Iterable[Book]) -> str:
+    return ''.join(f"{book.author},{book.publisher},{book.pages},{book.price},{book.isbn}\n" for book in books)
+
+def write_books(filename: str, books: Iterable[Book]) -> None:
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(format_books(books))
+
+def read_books(filename: str, chunk_bytes: int = 1 << 20) -> Iterator[Book]:
+    with open(filename, 'r', encoding='utf-8') as f:
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                break
+            yield from parse_books(''.join(lines))
+
+class _Descending:
+    # Обращает сравнение значения, для которого нельзя взять минус (строки)
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+def merge_key(key: SortKey) -> Callable[[Book], Any]:
+    # Один ключ слияния с тем же порядком, что и у BookArray.sort(key):
+    # убывающие поля обращаются минусом (числа) или обёрткой _Descending
+    specs = key if isinstance(key, (tuple, list)) else (key,)
+    parts: List[Callable[[Book], Any]] = []
+    for spec in specs:
+        if callable(spec):
+            parts.append(spec)
+            continue
+        field = spec.lstrip('-')
+        if field not in BOOK_FIELDS:
+            raise ValueError(f"Неизвестное поле книги: {field}")
+        getter = attrgetter(field)
+        if not spec.startswith('-'):
+            parts.append(getter)
+        elif field in ('pages', 'price'):
+            parts.append(lambda book, getter=getter: -getter(book))
+        else:
+            parts.append(lambda book, getter=getter: _Descending(getter(book)))
+    if len(parts) == 1:
+        return parts[0]
+    return lambda book: tuple([part(book) for part in parts])
+
+def memory_factor(sample: str, key: Callable[[Book], Any]) -> float:
+    # Во сколько раз блок текста больше в памяти: размеры объектов (sys.getsizeof)
+    # измеряются на образце - строки readlines и склеенный текст, поля при разборе,
+    # книги со значениями полей и ключи сортировки. Зависит от длины строк и
+    # ключа, поэтому постоянная оценка для всех файлов не годится
+    if not sample:
+        return 1.0
+    lines = sample.splitlines(keepends=True)
+    fields = _split_fields(sample)
+    books = parse_books(sample)
+    size = getsizeof(sample) + getsizeof(lines) + sum(map(getsizeof, lines))
+    size += getsizeof(fields) + sum(map(getsizeof, fields))
+    size += getsizeof(books) + sum(getsizeof(book) + getsizeof(book.__dict__) + getsizeof(book.pages) +
+                                   getsizeof(book.price) for book in books)
+    keys = list(map(key, books))
+    size += getsizeof(keys) + sum(map(getsizeof, keys))
+    return size / len(sample)
+
+def _sort_run(task: Tuple[str, SortKey, bool, str]) -> int:
+    # Выполняется в процессе пула: разбирает блок, сортирует его и пишет серию
+    text, key, reverse, run_filename = task
+    books = BookArray()
+    books.books = parse_books(text)
+    books.sort(key, reverse=reverse)
+    write_books(run_filename, books)
+    return len(books)
+
+def _read_keyed_lines(filename: str, key: Callable[[Book], Any], read_bytes: int) -> Iterator[Tuple[Any, str]]:
+    # Книги разбираются только ради ключа; в результат идёт исходная строка
+    with open(filename, 'r', encoding='utf-8') as f:
+        while True:
+            lines = f.readlines(read_bytes)
+            if not lines:
+                break
+            yield from zip(map(key, parse_books(''.join(lines))), lines)
+
+def _merge_runs(run_filenames: List[str], output: str, key: Callable[[Book], Any], reverse: bool,
+                read_bytes: int) -> None:
+    # heapq.merge при равных ключах берёт строку из более ранней серии, поэтому
+    # слияние устойчиво, как и сортировка каждой серии
+    with open(output, 'w', encoding='utf-8') as f:
+        merged = heapq.merge(*(_read_keyed_lines(run, key, read_bytes) for run in run_filenames),
+                             key=itemgetter(0), reverse=reverse)
+        f.writelines(map(itemgetter(1), merged))
+
+# Внешняя сортировка файла книг: файл читается блоками, которые помещаются в
+# memory_limit байт с учётом всех workers процессов, каждый блок сортируется
+# BookArray.sort в пуле процессов и пишется во временный файл-серию, затем серии
+# сливаются кучей (при большом числе - в несколько проходов по fan_in). При слиянии
+# бюджет делится между сливаемыми сериями: каждая читается блоками по
+# memory_limit // fan_in байт с учётом разбора в книги и буферов файла, а fan_in
+# уменьшается, если иначе блок вышел бы меньше MIN_MERGE_READ. Во сколько раз
+# блок вырастает при разборе, измеряется memory_factor на начале файла.
+# key - как у BookArray.sort; функции-ключи должны передаваться pickle (без лямбд)
+def external_sort(input_filename: str, output_filename: str, key: SortKey, reverse: bool = False,
+                  workers: int = 1, memory_limit: int = 64 << 20, temp_dir: Optional[str] = None,
+                  fan_in: int = MERGE_FAN_IN) -> int:
+    workers = max(workers, 1)
+    merge_key_func = merge_key(key)
+    with open(input_filename, 'r', encoding='utf-8') as f:
+        sample = ''.join(f.readlines(max(min(MEMORY_SAMPLE, memory_limit // 64), 1)))
+    factor = memory_factor(sample, merge_key_func)
+    del sample
+    # Одновременно в памяти: блок, который читается, и по блоку в каждом процессе
+    chunk_bytes = max(int(memory_limit // ((workers + 1) * factor)), 4096)
+    run_dir = tempfile.mkdtemp(prefix='book_runs_', dir=temp_dir)
+    try:
+        runs: List[str] = []
+        total = 0
+        with open(input_filename, 'r', encoding='utf-8') as f:
+            chunks = iter(lambda: ''.join(f.readlines(chunk_bytes)), '')
+            tasks = ((text, key, reverse, os.path.join(run_dir, f'run{i}.txt')) for i, text in enumerate(chunks))
+            if workers == 1:
+                for task in tasks:
+                    total += _sort_run(task)
+                    runs.append(task[3])
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    pending = {}
+                    for task in tasks:
+                        # Не больше workers блоков в работе, иначе прочитанные блоки копятся в памяти
+                        if len(pending) >= workers:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                total += future.result()
+                                del pending[future]
+                        pending[executor.submit(_sort_run, task)] = task[3]
+                        runs.append(task[3])
+                    for future in pending:
+                        total += future.result()
+
+        # Буфер выходного файла занят всё слияние; у каждой серии - свои буферы и блок
+        merge_memory = memory_limit - FILE_BUFFER_BYTES
+        fan_in = max(2, min(fan_in, int(merge_memory // (factor * MIN_MERGE_READ + FILE_BUFFER_BYTES))))
+        read_bytes = max(int((merge_memory // fan_in - FILE_BUFFER_BYTES) // factor), 1)
+        level = 0
+        while len(runs) > fan_in:
+            merged_runs = []
+            for i in range(0, len(runs), fan_in):
+                merged = os.path.join(run_dir, f'merge{level}_{i}.txt')
+                _merge_runs(runs[i:i + fan_in], merged, merge_key_func, reverse, read_bytes)
+                for run in runs[i:i + fan_in]:
+                    os.remove(run)
+                merged_runs.append(merged)
+            runs = merged_runs
+            level += 1
+        _merge_runs(runs, output_filename, merge_key_func, reverse, read_bytes)
+        return total
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+def author_name_length(book: Book) -> int:
+    return len(book.author)
+
+# Функция для тестирования внешней сортировки
+def tests_external_sort() -> None:
+    print("\nТесты:")
+    books = [Book(f"Автор {(i * 37) % 101}", f"Издательство {i % 7}", 100 + (i * 13) % 500,
+                  float((i * 7919) % 300) / 2, f"{i % 10}-{(i * 31) % 977}-{i}") for i in range(3000)]
+    write_books('test_books.txt', books)
+    try:
+        # Тест 1. Формат файла не теряет данных
+        assert [(b.author, b.publisher, b.pages, b.price, b.isbn) for b in read_books('test_books.txt', 100)] == \
+            [(b.author, b.publisher, b.pages, b.price, b.isbn) for b in books]
+
+        try:
+            # Сдвинутые поля разобрались бы без ошибок: её даёт только проверка строк
+            parse_books("A,P,100,10.0\n5-5,B,P,200,20.0,1-2\n")
+            assert False, "Ожидалась ошибка ValueError"
+        except ValueError:
+            pass
+
+        # Тест 2. Результат совпадает с BookArray.sort, включая порядок равных;
+        # маленький бюджет памяти даёт много серий и несколько проходов слияния
+        for key, reverse, workers in (("price", False, 1), ("-pages", False, 2), (("publisher", "-price"), False, 2),
+                                      (("-publisher", "isbn"), True, 1), (author_name_length, False, 2)):
+            expected = BookArray()
+            for book in books:
+                expected.append(book)
+            expected.sort(key, reverse=reverse)
+            count = external_sort('test_books.txt', 'test_books_sorted.txt', key, reverse=reverse,
+                                  workers=workers, memory_limit=200000, fan_in=3)
+            assert count == len(books)
+            assert [b.isbn for b in read_books('test_books_sorted.txt')] == [b.isbn for b in expected], key
+
+        # Тест 3. При малом бюджете число сливаемых за проход серий уменьшается
+        count = external_sort('test_books.txt', 'test_books_sorted.txt', "isbn", memory_limit=80000)
+        assert count == len(books)
+        assert [b.isbn for b in read_books('test_books_sorted.txt')] == sorted(b.isbn for b in books)
+
+        # Тест 4. Пиковая память (tracemalloc) не выходит за memory_limit: размер
+        # блоков выводится из измеренного на начале файла роста при разборе
+        for memory_limit in (400000, 1 << 20):
+            for key in ("isbn", ("publisher", "-price")):
+                tracemalloc.start()
+                try:
+                    external_sort('test_books.txt', 'test_books_sorted.txt', key, memory_limit=memory_limit)
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                assert peak <= memory_limit, (key, memory_limit, peak)
+
+        # Тест 5. Пустой файл
+        write_books('test_books.txt', [])
+        assert external_sort('test_books.txt', 'test_books_sorted.txt', "price") == 0
+        assert list(read_books('test_books_sorted.txt')) == []
+    finally:
+        for filename in ('test_books.txt', 'test_books_sorted.txt'):
+            if os.path.exists(filename):
+                os.remove(filename)
+    print("Все тесты пройдены!")
+
+# Функция для выполнения бенчмарков
+def benchmarks(n: int = 1000000, memory_limit: int = 64 << 20) -> None:
+    print("\nБенчмарки")
+    write_books('benchmark_books.txt', (Book(f'Author{i}', f'Publisher{i % 100}', i % 1000 + 100,
+                                             (i * 7919) % 100000 / 100, f'ISBN{i}') for i in range(n)))
+    size = os.path.getsize('benchmark_books.txt')
+    print(f"Файл из {n} книг: {size / (1 << 20):.1f} МБ, бюджет памяти {memory_limit >> 20} МБ")
+    try:
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            start = time.time()
+            external_sort('benchmark_books.txt', 'benchmark_books_sorted.txt', ("publisher", "-price"),
+                          workers=workers, memory_limit=memory_limit)
+            end = time.time()
+            print(f"Внешняя сортировка по издательству и убыванию цены, процессов: {workers}: "
+                  f"{(end - start):.5f} секунд")
+    finally:
+        for filename in ('benchmark_books.txt', 'benchmark_books_sorted.txt'):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+# Запуск тестов и бенчмарков
+if __name__ == "__main__":
+    tests_external_sort()
+    benchmarks()
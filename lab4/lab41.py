@@ -1,4 +1,7 @@
-from typing import List
+from bisect import bisect_left, bisect_right
+from itertools import chain, compress, islice
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 import time
 
 # Класс книги с полями: автор, издательство, количество страниц, стоимость, ISBN
@@ -13,52 +16,302 @@ class Book:
     def __repr__(self) -> str:
         return f"Book(author='{self.author}', publisher='{self.publisher}', pages={self.pages}, price={self.price}, ISBN='{self.isbn}')"
 
+# Поля, по которым можно сортировать книги
+BOOK_FIELDS = ('author', 'publisher', 'pages', 'price', 'isbn')
+SortKey = Union[str, Callable[[Book], Any], Sequence[Union[str, Callable[[Book], Any]]]]
+# Поля для поразрядных сортировок: целые - сортировка подсчётом, строки - radix
+INT_FIELDS = ('pages',)
+STR_FIELDS = ('author', 'publisher', 'isbn')
+# В MSD radix короткие отрезки досортировываются вставками
+MSD_INSERTION_SIZE = 16
+
+# Устойчивая сортировка подсчётом по целому ключу: книги раскладываются по
+# корзинам значений и склеиваются по порядку. O(n + k), k - разброс значений;
+# при разбросе много больше n выгоднее обычная сортировка
+def counting_sort(items: List[Any], key: Callable[[Any], int], reverse: bool = False) -> List[Any]:
+    if not items:
+        return []
+    keys = list(map(key, items))
+    low = min(keys)
+    spread = max(keys) - low + 1
+    if spread > 4 * len(items) + 1024:
+        return sorted(items, key=key, reverse=reverse)
+    buckets: List[List[Any]] = [[] for _ in range(spread)]
+    for item, k in zip(items, keys):
+        buckets[k - low].append(item)
+    if reverse:
+        buckets.reverse()
+    return list(chain.from_iterable(buckets))
+
+# Устойчивая LSD radix сортировка по строковому ключу: проход по каждой позиции
+# символа справа налево, раскладка по корзинам кода символа. O(n * длина ключа)
+def lsd_radix_sort(items: List[Any], key: Callable[[Any], str], reverse: bool = False) -> List[Any]:
+    pairs = list(zip(map(key, items), items))
+    width = max((len(k) for k, _ in pairs), default=0)
+    for position in range(width - 1, -1, -1):
+        buckets: Dict[str, List[Tuple[str, Any]]] = {}
+        for pair in pairs:
+            k = pair[0]
+            # Короткая строка меньше любой своей продолжения: её "символ" - пустая строка
+            buckets.setdefault(k[position] if position < len(k) else '', []).append(pair)
+        if len(buckets) > 1:
+            pairs = [pair for char in sorted(buckets, reverse=reverse) for pair in buckets[char]]
+    return [item for _, item in pairs]
+
+# Устойчивая MSD radix сортировка: раскладка по первому символу, затем каждая
+# корзина отдельно по следующему; короткие корзины досортировываются вставками.
+# Обходит только различающиеся префиксы, поэтому на длинных общих префиксах быстрее LSD
+def msd_radix_sort(items: List[Any], key: Callable[[Any], str], reverse: bool = False) -> List[Any]:
+    pairs = list(zip(map(key, items), items))
+    stack = [(0, len(pairs), 0)]
+    while stack:
+        lo, hi, position = stack.pop()
+        if hi - lo <= MSD_INSERTION_SIZE:
+            _insertion_sort_pairs(pairs, lo, hi, reverse)
+            continue
+        buckets: Dict[str, List[Tuple[str, Any]]] = {}
+        for i in range(lo, hi):
+            k = pairs[i][0]
+            buckets.setdefault(k[position] if position < len(k) else '', []).append(pairs[i])
+        start = lo
+        for char in sorted(buckets, reverse=reverse):
+            bucket = buckets[char]
+            pairs[start:start + len(bucket)] = bucket
+            # Закончившиеся строки равны между собой и уже на месте
+            if char and len(bucket) > 1:
+                stack.append((start, start + len(bucket), position + 1))
+            start += len(bucket)
+    return [item for _, item in pairs]
+
+def _insertion_sort_pairs(pairs: List[Tuple[str, Any]], lo: int, hi: int, reverse: bool) -> None:
+    for i in range(lo + 1, hi):
+        pair = pairs[i]
+        j = i - 1
+        while j >= lo and (pairs[j][0] < pair[0] if reverse else pair[0] < pairs[j][0]):
+            pairs[j + 1] = pairs[j]
+            j -= 1
+        pairs[j + 1] = pair
+
+RADIX_SORTS = {'counting': counting_sort, 'lsd': lsd_radix_sort, 'msd': msd_radix_sort}
+
+# Постоянное упорядоченное представление книг по одному полю: отсортированные
+# ключи и параллельный список ссылок на те же объекты Book (книги не копируются).
+# Массив обновляет представление при добавлении и удалении двоичной вставкой и
+# удалением, без пересортировки; перестановки самого массива его не затрагивают.
+# Книги с равными ключами идут в порядке добавления
+class SortedView:
+    def __init__(self, field: str, books: Iterable[Optional[Book]]) -> None:
+        self.field = field
+        self.key = attrgetter(field)
+        self.books = sorted((book for book in books if book is not None), key=self.key)
+        self.keys = list(map(self.key, self.books))
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def __iter__(self) -> Iterator[Book]:
+        return iter(self.books)
+
+    def __reversed__(self) -> Iterator[Book]:
+        return reversed(self.books)
+
+    def __getitem__(self, index: int) -> Book:
+        return self.books[index]
+
+    def insert(self, book: Book) -> None:
+        k = self.key(book)
+        position = bisect_right(self.keys, k)
+        self.keys.insert(position, k)
+        self.books.insert(position, book)
+
+    def remove(self, book: Book) -> None:
+        # Двоичный поиск отрезка равных ключей, в нём - сама книга
+        k = self.key(book)
+        for position in range(bisect_left(self.keys, k), bisect_right(self.keys, k)):
+            if self.books[position] is book:
+                del self.keys[position]
+                del self.books[position]
+                return
+        raise ValueError(f"Книги нет в представлении по полю {self.field}: {book}")
+
+    def discard_isbns(self, isbns: Set[str]) -> None:
+        # Пакетное удаление одним проходом; порядок остальных не меняется
+        keep = [book.isbn not in isbns for book in self.books]
+        self.keys = list(compress(self.keys, keep))
+        self.books = list(compress(self.books, keep))
+
+    # Книги с ключом в диапазоне [lo, hi]; None - без ограничения с этой стороны
+    def range(self, lo: Any = None, hi: Any = None) -> Iterator[Book]:
+        start = 0 if lo is None else bisect_left(self.keys, lo)
+        stop = len(self.keys) if hi is None else bisect_right(self.keys, hi)
+        return islice(self.books, start, stop)
+
 # Класс массива книг с методами сортировки, добавления, удаления и итерируемостью
 class BookArray:
     def __init__(self) -> None:
-        self.books: List[Book] = []
+        # Удалённые книги заменяются на None и вычищаются при сжатии
+        self.books: List[Optional[Book]] = []
+        self.deleted = 0
+        # ISBN -> позиция первой книги с этим ISBN в self.books; None - индекс
+        # устарел после перестановки книг и будет перестроен при первом обращении.
+        # Позиции остальных книг с повторяющимся ISBN - в isbn_duplicates
+        self.isbn_index: Optional[Dict[str, int]] = {}
+        self.isbn_duplicates: Dict[str, List[int]] = {}
+        # Упорядоченные представления по полям, создаются view(field) по требованию.
+        # Прямая замена self.books их не обновляет
+        self.views: Dict[str, SortedView] = {}
 
     def __repr__(self) -> str:
-        return f"[{', '.join(str(book) for book in self.books)}]"
+        return f"[{', '.join(str(book) for book in self)}]"
+
+    def __len__(self) -> int:
+        return len(self.books) - self.deleted
 
     # Метод для добавления книги
     def append(self, book: Book) -> None:
+        if self.isbn_index is not None:
+            if book.isbn in self.isbn_index:
+                self.isbn_duplicates.setdefault(book.isbn, []).append(len(self.books))
+            else:
+                self.isbn_index[book.isbn] = len(self.books)
         self.books.append(book)
+        for view in self.views.values():
+            view.insert(book)
 
-    # Метод для удаления книги по ISBN
+    # Метод для поиска книги по ISBN за O(1)
+    def get(self, isbn: str) -> Optional[Book]:
+        position = self._index().get(isbn)
+        return None if position is None else self.books[position]
+
+    # Метод для удаления книг по ISBN: позиции берутся из индекса, на их место
+    # ставится None; массив сжимается, когда удалённых становится больше половины
     def delete(self, isbn: str) -> None:
-        self.books = [book for book in self.books if book.isbn != isbn]
+        position = self._index().pop(isbn, None)
+        if position is None:
+            return
+        positions = [position] + self.isbn_duplicates.pop(isbn, [])
+        for position in positions:
+            for view in self.views.values():
+                view.remove(self.books[position])
+            self.books[position] = None
+        self.deleted += len(positions)
+        if self.deleted * 2 > len(self.books):
+            self._compact()
+
+    # Метод для удаления книг с любым из ISBN за один проход по массиву
+    def delete_many(self, isbns: Iterable[str]) -> int:
+        targets = set(isbns)
+        books = self.books
+        size = len(self)
+        write = 0
+        for book in books:
+            if book is not None and book.isbn not in targets:
+                books[write] = book
+                write += 1
+        del books[write:]
+        self.deleted = 0
+        self.isbn_index = None
+        if size != write:
+            for view in self.views.values():
+                view.discard_isbns(targets)
+        return size - write
+
+    # Упорядоченное по полю представление; создаётся один раз за O(n log n) и
+    # дальше поддерживается при append/delete, так что переключение между
+    # порядками (по цене, по ISBN, ...) не требует пересортировки массива
+    def view(self, field: str) -> SortedView:
+        sorted_view = self.views.get(field)
+        if sorted_view is None:
+            if field not in BOOK_FIELDS:
+                raise ValueError(f"Неизвестное поле книги: {field}")
+            sorted_view = self.views[field] = SortedView(field, self.books)
+        return sorted_view
+
+    def _index(self) -> Dict[str, int]:
+        if self.isbn_index is None:
+            # Индекс сбрасывается только вместе со сжатием, поэтому None в массиве нет.
+            # Обход с конца оставляет в словаре позицию первой книги с каждым ISBN
+            books = self.books
+            index = dict(zip(map(attrgetter('isbn'), reversed(books)), range(len(books) - 1, -1, -1)))
+            duplicates: Dict[str, List[int]] = {}
+            if len(index) < len(books):
+                for position, book in enumerate(books):
+                    if index[book.isbn] != position:
+                        duplicates.setdefault(book.isbn, []).append(position)
+            self.isbn_index = index
+            self.isbn_duplicates = duplicates
+        return self.isbn_index
+
+    def _compact(self) -> None:
+        if self.deleted:
+            self.books[:] = [book for book in self.books if book is not None]
+            self.deleted = 0
+            self.isbn_index = None
 
-    # Метод сортировки перемешиванием (Shaker sort) по возрастанию цены
+    # Общая сортировка: Timsort (O(n log n), устойчивая), ключ вычисляется один раз на книгу.
+    # key - функция, имя поля ("price", "-price" - по убыванию) или кортеж таких
+    # описаний, например ("publisher", "-price"): сначала по издательству, при
+    # равных - по убыванию цены. Все алгоритмы устойчивы.
+    # algorithm='counting' (целые поля) или 'lsd'/'msd' (строковые поля) - устойчивые
+    # поразрядные сортировки за O(n * k); ключ в этом случае - только имена полей.
+    # Timsort сам адаптивный: находит готовые серии и сливает их с галопом, поэтому
+    # отсортированный массив с k дописанными книгами пересортировывается за
+    # O(n + k log n) - отдельный режим для почти отсортированных данных не нужен
+    def sort(self, key: SortKey, reverse: bool = False, algorithm: str = 'timsort') -> None:
+        self._compact()
+        if algorithm == 'timsort':
+            # Поля с разным направлением сортируются отдельными устойчивыми проходами,
+            # начиная с последнего; соседние поля одного направления - за один проход
+            for key_func, descending in reversed(self._sort_passes(key)):
+                self.books.sort(key=key_func, reverse=descending != reverse)
+        elif algorithm in RADIX_SORTS:
+            specs = key if isinstance(key, (tuple, list)) else (key,)
+            fields = INT_FIELDS if algorithm == 'counting' else STR_FIELDS
+            for spec in specs:
+                if not isinstance(spec, str) or spec.lstrip('-') not in fields:
+                    raise ValueError(f"Сортировка {algorithm} работает только по полям {fields}")
+            for spec in reversed(specs):
+                self.books[:] = RADIX_SORTS[algorithm](self.books, attrgetter(spec.lstrip('-')),
+                                                       spec.startswith('-') != reverse)
+        else:
+            raise ValueError(f"Неизвестный алгоритм сортировки: {algorithm}")
+        self.isbn_index = None
+
+    @staticmethod
+    def _sort_passes(key: SortKey) -> List[Tuple[Callable[[Book], Any], bool]]:
+        specs = key if isinstance(key, (tuple, list)) else (key,)
+        passes: List[Tuple[List[Any], bool]] = []
+        for spec in specs:
+            if callable(spec):
+                passes.append(([spec], False))
+                continue
+            descending = spec.startswith('-')
+            field = spec.lstrip('-')
+            if field not in BOOK_FIELDS:
+                raise ValueError(f"Неизвестное поле книги: {field}")
+            if passes and passes[-1][1] == descending and isinstance(passes[-1][0][0], str):
+                passes[-1][0].append(field)
+            else:
+                passes.append(([field], descending))
+        return [(attrgetter(*fields) if isinstance(fields[0], str) else fields[0], descending)
+                for fields, descending in passes]
+
+    # Сортировка по возрастанию цены (раньше - сортировка перемешиванием)
     def cocktail_sort(self) -> None:
-        left = 0
-        right = len(self.books) - 1
-        while left < right:
-            for i in range(left, right):
-                if self.books[i].price > self.books[i + 1].price:
-                    self.books[i], self.books[i + 1] = self.books[i + 1], self.books[i]
-            right -= 1
-            for i in range(right, left, -1):
-                if self.books[i - 1].price > self.books[i].price:
-                    self.books[i], self.books[i - 1] = self.books[i - 1], self.books[i]
-            left += 1
-
-    # Метод сортировки выбором (Selection sort) по убыванию количества страниц
+        self.sort('price')
+
+    # Сортировка по убыванию количества страниц (раньше - сортировка выбором)
     def selection_sort(self) -> None:
-        n = len(self.books)
-        for i in range(n - 1):
-            max_idx = i
-            for j in range(i + 1, n):
-                if self.books[j].pages > self.books[max_idx].pages:
-                    max_idx = j
-            self.books[i], self.books[max_idx] = self.books[max_idx], self.books[i]       
+        self.sort('-pages')
 
     # Делает класс итерируемым
-    def __iter__(self):
-        return iter(self.books)
+    def __iter__(self) -> Iterator[Book]:
+        if not self.deleted:
+            return iter(self.books)
+        return (book for book in self.books if book is not None)
     
     def __str__(self) -> str:
-        return '\n'.join(str(book) for book in self.books)
+        return '\n'.join(str(book) for book in self)
 
 # Функция для тестирования класса BookArray
 def tests_array() -> None:
@@ -104,6 +357,107 @@ def tests_array() -> None:
     for book in arr:
         print(book)
 
+    # Тест 6. Сортировка по нескольким полям с разным направлением
+    arr = BookArray()
+    for book in books:
+        arr.append(book)
+    arr.sort(("publisher", "-price"))
+    print(f"\nArray после сортировки по издательству и убыванию цены:\n{arr}")
+    assert [(book.publisher, -book.price) for book in arr] == sorted((book.publisher, -book.price) for book in books)
+    arr.sort("price", reverse=True)
+    assert [book.price for book in arr] == sorted((book.price for book in books), reverse=True)
+    # Устойчивость: книги с равной ценой сохраняют порядок по издательству
+    assert [book.isbn for book in arr][4:6] == ["7-1343-16", "8-3165-3614"]
+    arr.sort(lambda book: len(book.author))
+    assert [len(book.author) for book in arr] == sorted(len(book.author) for book in books)
+    try:
+        arr.sort("title")
+        assert False, "Ожидалась ошибка ValueError"
+    except ValueError:
+        pass
+
+    # Тест 7. Индекс по ISBN остаётся верным после удалений и сортировок
+    arr = BookArray()
+    for book in books:
+        arr.append(book)
+    arr.append(Book("Джек Лондон", "АСТ", 500, 899.0, "7-1343-16"))
+    assert arr.get("9-5631-156").author == "Михаил Булгаков" and arr.get("0-000-00") is None
+    arr.delete("7-1343-16")
+    assert len(arr) == 9 and arr.get("7-1343-16") is None
+    assert all(book.isbn != "7-1343-16" for book in arr)
+    arr.sort("isbn")
+    assert arr.get("6-4166-815").author == "Джон Мильтон"
+    assert [book.isbn for book in arr] == sorted(book.isbn for book in books if book.isbn != "7-1343-16")
+    assert arr.delete_many(["1-145-17", "2-190-10", "0-000-00"]) == 2
+    assert len(arr) == 7 and len(arr.books) == 7
+    assert arr.get("3-1342-2413").price == 320.0
+    arr.append(Book("Лия Арден", "Эксмо", 300, 990.0, "1-145-17"))
+    assert arr.get("1-145-17").pages == 300
+    # Сжатие при удалении больше половины книг
+    for isbn in ("3-1342-2413", "4-4551-18", "5-51-1998"):
+        arr.delete(isbn)
+    assert arr.deleted == 3 and len(arr) == 5
+    arr.delete("6-4166-815")
+    arr.delete("8-21-3145")
+    assert arr.deleted == 0 and len(arr.books) == 3 and arr.get("9-5631-156").pages == 1114
+
+    # Тест 8. Поразрядные сортировки совпадают с Timsort, включая порядок равных
+    many = [Book(f"Автор {i % 13}", f"Изд-во {i % 5}", 100 + (i * 37) % 50, float(i % 7),
+                 f"{(i * 7919) % 97}-{i % 3}{'x' * (i % 4)}") for i in range(500)] + books
+    for key, reverse in (("pages", False), ("-pages", False), ("pages", True), (("-publisher", "isbn"), False),
+                         ("isbn", True), ("author", False)):
+        expected = BookArray()
+        for book in many:
+            expected.append(book)
+        expected.sort(key, reverse=reverse)
+        for algorithm in (("counting",) if "pages" in key else ("lsd", "msd")):
+            arr = BookArray()
+            for book in many:
+                arr.append(book)
+            arr.sort(key, reverse=reverse, algorithm=algorithm)
+            assert [book.isbn for book in arr] == [book.isbn for book in expected], (key, algorithm)
+    try:
+        arr.sort("price", algorithm="counting")
+        assert False, "Ожидалась ошибка ValueError"
+    except ValueError:
+        pass
+    assert counting_sort([], len) == [] and lsd_radix_sort([], str) == [] and msd_radix_sort([], str) == []
+
+    # Тест 9. Упорядоченные представления обновляются при добавлении и удалении
+    arr = BookArray()
+    for book in many[:300]:
+        arr.append(book)
+    by_price = arr.view("price")
+    by_isbn = arr.view("isbn")
+    assert arr.view("price") is by_price
+    for book in many[300:]:
+        arr.append(book)
+    arr.sort("-pages")
+    arr.delete(many[0].isbn)
+    arr.delete(many[1].isbn)
+    by_pages = arr.view("pages")
+    arr.delete_many([book.isbn for book in many[2:40]])
+    arr.append(Book("Новый автор", "Эксмо", 120, 3.0, "0-new"))
+    for field, sorted_view in (("price", by_price), ("isbn", by_isbn), ("pages", by_pages)):
+        assert [getattr(book, field) for book in sorted_view] == sorted(getattr(book, field) for book in arr), field
+        # Представление хранит ссылки на те же книги, что и массив
+        assert sorted(map(id, sorted_view)) == sorted(map(id, arr)), field
+    # Равные ключи - в порядке добавления, независимо от сортировок массива
+    assert [book.isbn for book in by_pages if book.pages == 100] == \
+        [book.isbn for book in many[40:] if book.pages == 100]
+    assert [book.price for book in by_price.range(2.0, 3.0)] == sorted(b.price for b in arr if 2.0 <= b.price <= 3.0)
+    assert list(by_isbn.range(hi="0-new"))[-1].isbn == "0-new" and next(reversed(by_price)).price == 1349.0
+    try:
+        by_price.remove(Book("Нет в массиве", "Эксмо", 100, 3.0, "0-none"))
+        assert False, "Ожидалась ошибка ValueError"
+    except ValueError:
+        pass
+    try:
+        arr.view("title")
+        assert False, "Ожидалась ошибка ValueError"
+    except ValueError:
+        pass
+
     print("Все тесты пройдены!")
 
 # Функция для выполнения бенчмарков
@@ -121,18 +475,108 @@ def benchmarks() -> None:
     end = time.time()
     print(f"Время добавления 10,000 элементов: {(end - start):.5f} секунд")
     
-    # Бенчмарк на сортировку перемешиванием
+    # Бенчмарк на сортировку по возрастанию цены
     start = time.time()
     arr.cocktail_sort()
     end = time.time()
-    print(f"Время сортировки перемешиванием для 10,000 элементов: {(end - start):.5f} секунд")
+    print(f"Время сортировки по возрастанию цены для 10,000 элементов: {(end - start):.5f} секунд")
     
-    # Бенчмарк на сортировку выбором
+    # Бенчмарк на сортировку по убыванию количества страниц
     start = time.time()
     arr.selection_sort()
     end = time.time()
-    print(f"Время сортировки выбором для 10,000 элементов: {(end - start):.5f} секунд")
+    print(f"Время сортировки по убыванию количества страниц для 10,000 элементов: {(end - start):.5f} секунд")
+
+    # Бенчмарк на сортировку 1,000,000 книг по двум полям
+    arr = BookArray()
+    for i in range(1000000):
+        arr.append(Book(f'Author{i}', f'Publisher{i % 100}', i % 1000 + 100, (i * 7919) % 100000 / 100, f'ISBN{i}'))
+    start = time.time()
+    arr.sort(("publisher", "-price"))
+    end = time.time()
+    print(f"Время сортировки по издательству и убыванию цены для 1,000,000 элементов: {(end - start):.5f} секунд")
+
+    # Бенчмарк на удаление: прежний способ (копия массива на каждое удаление),
+    # удаление через индекс и пакетное удаление
+    isbns = [f'ISBN{i}' for i in range(0, 1000000, 100)]
+    start = time.time()
+    books = arr.books
+    for isbn in isbns[:5]:
+        books = [book for book in books if book.isbn != isbn]
+    end = time.time()
+    print(f"Время удаления 5 элементов копированием из 1,000,000: {(end - start):.5f} секунд")
+    start = time.time()
+    for isbn in isbns[:5000]:
+        arr.delete(isbn)
+    end = time.time()
+    print(f"Время удаления 5,000 элементов через индекс из 1,000,000 (с перестройкой индекса после сортировки): {(end - start):.5f} секунд")
+    start = time.time()
+    arr.delete_many(isbns[5000:])
+    end = time.time()
+    print(f"Время пакетного удаления 5,000 элементов из 1,000,000: {(end - start):.5f} секунд")
+
+# Бенчмарк поразрядных сортировок против Timsort на разных размерах массива
+def benchmark_radix(sizes: Tuple[int, ...] = (100, 1000, 10000, 100000, 1000000)) -> None:
+    print("\nБенчмарки поразрядных сортировок")
+    for n in sizes:
+        books = [Book(f'Author{i}', f'Publisher{i % 100}', (i * 7919) % 1000 + 100, 100.0,
+                      f'ISBN{(i * 7919) % n:07d}') for i in range(n)]
+        for key, algorithm in (("pages", "timsort"), ("pages", "counting"),
+                               ("isbn", "timsort"), ("isbn", "lsd"), ("isbn", "msd")):
+            arr = BookArray()
+            arr.books = list(books)
+            start = time.perf_counter()
+            arr.sort(key, algorithm=algorithm)
+            end = time.perf_counter()
+            print(f"Сортировка {n} элементов по {key} ({algorithm}): {(end - start):.5f} секунд")
+
+# Бенчмарк упорядоченных представлений: смена порядка и добавление книг с
+# пересортировкой массива против поддерживаемых представлений
+def benchmark_views(n: int = 200000, k: int = 100) -> None:
+    print("\nБенчмарки упорядоченных представлений")
+    books = [Book(f'Author{i}', f'Publisher{i % 100}', (i * 31) % 1000 + 100, (i * 7919) % 100000 / 100,
+                  f'ISBN{(i * 7919) % n:07d}') for i in range(n)]
+    new_books = [Book('Author', 'Publisher', 100 + i, i / 10, f'New{i}') for i in range(k)]
+    arr = BookArray()
+    arr.books = list(books)
+    start = time.perf_counter()
+    for field in ("price", "isbn", "pages", "price"):
+        arr.sort(field)
+    end = time.perf_counter()
+    print(f"Переключение порядка 4 раза пересортировкой {n} элементов: {(end - start):.5f} секунд")
+    start = time.perf_counter()
+    for book in new_books:
+        arr.append(book)
+        arr.sort("price")
+    end = time.perf_counter()
+    print(f"Добавление {k} элементов с пересортировкой после каждого: {(end - start):.5f} секунд")
+
+    arr = BookArray()
+    arr.books = list(books)
+    start = time.perf_counter()
+    views = [arr.view(field) for field in ("price", "isbn", "pages")]
+    end = time.perf_counter()
+    print(f"Построение представлений по цене, ISBN и страницам для {n} элементов: {(end - start):.5f} секунд")
+    start = time.perf_counter()
+    for sorted_view in views + views[:1]:
+        for _ in sorted_view:
+            pass
+    end = time.perf_counter()
+    print(f"Переключение порядка 4 раза через представления (с обходом): {(end - start):.5f} секунд")
+    start = time.perf_counter()
+    for book in new_books:
+        arr.append(book)
+    end = time.perf_counter()
+    print(f"Добавление {k} элементов с обновлением 3 представлений: {(end - start):.5f} секунд")
+    start = time.perf_counter()
+    for book in new_books:
+        arr.delete(book.isbn)
+    end = time.perf_counter()
+    print(f"Удаление {k} элементов с обновлением 3 представлений: {(end - start):.5f} секунд")
 
 # Запуск тестов и бенчмарков
-tests_array()
-benchmarks()
+if __name__ == "__main__":
+    tests_array()
+    benchmarks()
+    benchmark_radix()
+    benchmark_views()
@@ -1,44 +1,33 @@
 import time
-from typing import List
+from typing import Any, List, Tuple
 
-class Book:
-    def __init__(self, author: str, publisher: str, pages: int, price: float, isbn: str) -> None:
-        self.author = author
-        self.publisher = publisher
-        self.pages = pages
-        self.price = price
-        self.isbn = isbn
+import lab41
+from lab41 import Book
 
-    def __repr__(self) -> str:
-        return f"Book(author='{self.author}', publisher='{self.publisher}', pages={self.pages}, price={self.price}, ISBN='{self.isbn}')"
-
-class BookArray:
-    def __init__(self) -> None:
-        self.books: List[Book] = []
-
-    def __repr__(self) -> str:
-        return f"[{', '.join(str(book) for book in self.books)}]"
-
-    def append(self, book: Book) -> None:
-        self.books.append(book)
+# Книга и общая сортировка sort() - из lab41
+class BookArray(lab41.BookArray):
+    # Сортировка по возрастанию ISBN (раньше - сортировка перемешиванием)
+    def cocktail_sort_isbn(self) -> None:
+        self.sort('isbn')
 
-    def delete(self, isbn: str) -> None:
-        self.books = [book for book in self.books if book.isbn != isbn]
+    # Быстрая сортировка по убыванию стоимости. mode='introsort' - основной режим
+    # (O(n log n) в худшем случае), mode='classic' - прежний вариант с опорным
+    # последним элементом, оставлен для сравнения. Почти отсортированный массив
+    # (отсортированный и с дописанными книгами) быстрее пересортировать через
+    # sort('-price'): Timsort сливает готовые серии за O(n + k log n)
+    def quick_sort_price(self, mode: str = 'introsort') -> None:
+        self._compact()
+        self.isbn_index = None
+        if mode == 'introsort':
+            # Цены сравниваются много раз, поэтому берём их один раз в отдельный список;
+            # по убыванию = по возрастанию отрицательной цены
+            introsort([-book.price for book in self.books], self.books)
+        elif mode == 'classic':
+            self._quick_sort_price_classic()
+        else:
+            raise ValueError(f"Неизвестный режим сортировки: {mode}")
 
-    def cocktail_sort_isbn(self) -> None:
-        left = 0
-        right = len(self.books) - 1
-        while left < right:
-            for i in range(left, right):
-                if self.books[i].isbn > self.books[i + 1].isbn:
-                    self.books[i], self.books[i + 1] = self.books[i + 1], self.books[i]
-            right -= 1
-            for i in range(right, left, -1):
-                if self.books[i - 1].isbn > self.books[i].isbn:
-                    self.books[i], self.books[i - 1] = self.books[i - 1], self.books[i]
-            left += 1
-
-    def quick_sort_price(self) -> None:
+    def _quick_sort_price_classic(self) -> None:
         # Используем стек для хранения границ
         stack = [(0, len(self.books) - 1)]
 
@@ -57,12 +46,109 @@ class BookArray:
                 stack.append((left, partition_index - 1))
                 stack.append((partition_index + 1, right))
 
+# Отрезки не длиннее этого сортируются вставками
+INSERTION_SORT_SIZE = 16
+# С этой длины опорный элемент выбирается как "псевдомедиана девяти" (ninther)
+NINTHER_SIZE = 128
 
-    def __iter__(self):
-        return iter(self.books)
-    
-    def __str__(self) -> str:
-        return '\n'.join(str(book) for book in self.books)
+# Интроспективная сортировка списков keys и items по возрастанию keys (неустойчивая):
+# быстрая сортировка с трёхпутевым разбиением, при слишком глубоком разбиении -
+# пирамидальная сортировка, короткие отрезки - вставками
+def introsort(keys: List[Any], items: List[Any]) -> None:
+    stack = [(0, len(keys) - 1, 2 * len(keys).bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while True:
+            if hi - lo < INSERTION_SORT_SIZE:
+                _insertion_sort(keys, items, lo, hi)
+                break
+            if depth == 0:
+                _heap_sort(keys, items, lo, hi)
+                break
+            depth -= 1
+            lt, gt = _partition3(keys, items, lo, hi, _choose_pivot(keys, lo, hi))
+            # Меньшая часть обрабатывается сразу, большая откладывается в стек,
+            # поэтому в стеке не больше O(log n) отрезков
+            if lt - lo < hi - gt:
+                stack.append((gt + 1, hi, depth))
+                hi = lt - 1
+            else:
+                stack.append((lo, lt - 1, depth))
+                lo = gt + 1
+
+def _median3(keys: List[Any], a: int, b: int, c: int) -> int:
+    if keys[a] < keys[b]:
+        if keys[b] < keys[c]:
+            return b
+        return c if keys[a] < keys[c] else a
+    if keys[a] < keys[c]:
+        return a
+    return c if keys[b] < keys[c] else b
+
+def _choose_pivot(keys: List[Any], lo: int, hi: int) -> Any:
+    mid = (lo + hi) // 2
+    if hi - lo + 1 < NINTHER_SIZE:
+        return keys[_median3(keys, lo, mid, hi)]
+    step = (hi - lo + 1) // 8
+    return keys[_median3(keys, _median3(keys, lo, lo + step, lo + 2 * step),
+                         _median3(keys, mid - step, mid, mid + step),
+                         _median3(keys, hi - 2 * step, hi - step, hi))]
+
+def _partition3(keys: List[Any], items: List[Any], lo: int, hi: int, pivot: Any) -> Tuple[int, int]:
+    # Разбиение "голландский флаг": [lo, lt) < pivot, [lt, gt] == pivot, (gt, hi] > pivot.
+    # Равные опорному элементы сразу встают на место и дальше не сортируются
+    lt, i, gt = lo, lo, hi
+    while i <= gt:
+        key = keys[i]
+        if key < pivot:
+            keys[lt], keys[i] = key, keys[lt]
+            items[lt], items[i] = items[i], items[lt]
+            lt += 1
+            i += 1
+        elif pivot < key:
+            keys[gt], keys[i] = key, keys[gt]
+            items[gt], items[i] = items[i], items[gt]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+def _insertion_sort(keys: List[Any], items: List[Any], lo: int, hi: int) -> None:
+    for i in range(lo + 1, hi + 1):
+        key, item = keys[i], items[i]
+        j = i - 1
+        while j >= lo and key < keys[j]:
+            keys[j + 1] = keys[j]
+            items[j + 1] = items[j]
+            j -= 1
+        keys[j + 1] = key
+        items[j + 1] = item
+
+def _heap_sort(keys: List[Any], items: List[Any], lo: int, hi: int) -> None:
+    n = hi - lo + 1
+    for start in range(n // 2 - 1, -1, -1):
+        _sift_down(keys, items, lo, start, n)
+    for end in range(n - 1, 0, -1):
+        keys[lo], keys[lo + end] = keys[lo + end], keys[lo]
+        items[lo], items[lo + end] = items[lo + end], items[lo]
+        _sift_down(keys, items, lo, 0, end)
+
+def _sift_down(keys: List[Any], items: List[Any], lo: int, root: int, size: int) -> None:
+    # Max-куча на отрезке keys[lo:lo + size]
+    key, item = keys[lo + root], items[lo + root]
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            break
+        if child + 1 < size and keys[lo + child] < keys[lo + child + 1]:
+            child += 1
+        if not key < keys[lo + child]:
+            break
+        keys[lo + root] = keys[lo + child]
+        items[lo + root] = items[lo + child]
+        root = child
+    keys[lo + root] = key
+    items[lo + root] = item
 
 # Функция для тестирования класса BookArray
 def tests_array() -> None:
@@ -108,6 +194,29 @@ def tests_array() -> None:
     for book in arr:
         print(book)
 
+    # Тест 6. Оба режима быстрой сортировки на разных входных данных
+    cases = {
+        "пустой": [],
+        "один элемент": [5.0],
+        "по возрастанию": [float(i) for i in range(300)],
+        "по убыванию": [float(i) for i in range(300, 0, -1)],
+        "много повторов": [float(i % 3) for i in range(300)],
+        "все равны": [699.99] * 100,
+        "случайный": [float((i * 7919) % 257) for i in range(300)],
+    }
+    for name, prices in cases.items():
+        for mode in ('introsort', 'classic'):
+            arr = BookArray()
+            for i, price in enumerate(prices):
+                arr.append(Book(f"Автор {i}", "Эксмо", 100, price, str(i)))
+            arr.quick_sort_price(mode)
+            assert [book.price for book in arr] == sorted(prices, reverse=True), (name, mode)
+    # Пирамидальная сортировка при исчерпании глубины
+    keys = [(i * 7919) % 1000 for i in range(1000)]
+    items = list(keys)
+    _heap_sort(keys, items, 100, 899)
+    assert keys[100:900] == sorted(items[100:900]) and keys == items
+
     print("Все тесты пройдены!")
 
 # Функция для выполнения бенчмарков
@@ -125,11 +234,11 @@ def benchmarks() -> None:
     end = time.time()
     print(f"Время добавления 10,000 элементов: {(end - start):.5f} секунд")
     
-    # Бенчмарк на сортировку перемешиванием
+    # Бенчмарк на сортировку по возрастанию ISBN
     start = time.time()
     arr.cocktail_sort_isbn()
     end = time.time()
-    print(f"Время сортировки перемешиванием для 10,000 элементов: {(end - start):.5f} секунд")
+    print(f"Время сортировки по возрастанию ISBN для 10,000 элементов: {(end - start):.5f} секунд")
     
     # Бенчмарк на сортировку по убыванию стоимости
     start = time.time()
@@ -137,6 +246,26 @@ def benchmarks() -> None:
     end = time.time()
     print(f"Время быстрой сортировки для 10,000 элементов: {(end - start):.5f} секунд")
 
+    # Бенчмарк режимов быстрой сортировки на разных входных данных
+    n = 5000
+    inputs = {
+        "по возрастанию": [i * 100.0 for i in range(n)],
+        "по убыванию": [i * 100.0 for i in range(n, 0, -1)],
+        "много повторов": [float(i % 10) for i in range(n)],
+        "случайный": [float((i * 7919) % n) for i in range(n)],
+        "по убыванию + 50 новых": [i * 100.0 for i in range(n - 50, 0, -1)] + [i * 7919.0 % n for i in range(50)],
+    }
+    for name, prices in inputs.items():
+        for mode in ('classic', 'introsort'):
+            arr = BookArray()
+            for i, price in enumerate(prices):
+                arr.append(Book(f'Author{i}', f'Publisher{i}', i + 100, price, f'ISBN{i}'))
+            start = time.time()
+            arr.quick_sort_price(mode)
+            end = time.time()
+            print(f"Время быстрой сортировки ({mode}, {name}) для {n} элементов: {(end - start):.5f} секунд")
+
 # Запуск тестов и бенчмарков
-tests_array()
-benchmarks()
+if __name__ == "__main__":
+    tests_array()
+    benchmarks()
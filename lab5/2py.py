@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class Book:
     def __init__(self, author: str, publisher: str, pages: int, price: float, isbn: str):
@@ -32,6 +32,54 @@ class Array:
                     self.books[i], self.books[i - 1] = self.books[i - 1], self.books[i]
             left += 1
 
+    # Устойчивая сортировка подсчётом по числу страниц: O(n + k), k - разброс значений;
+    # при разбросе много больше n корзины не выделяются, а используется sorted()
+    def counting_sort_pages(self) -> None:
+        if not self.books:
+            return
+        low: int = min(book.pages for book in self.books)
+        spread: int = max(book.pages for book in self.books) - low + 1
+        if spread > 4 * len(self.books) + 1024:
+            self.books = sorted(self.books, key=lambda book: book.pages)
+            return
+        buckets: List[List[Book]] = [[] for _ in range(spread)]
+        for book in self.books:
+            buckets[book.pages - low].append(book)
+        self.books = [book for bucket in buckets for book in bucket]
+
+    # Устойчивая поразрядная сортировка по ISBN за O(n * длина ISBN).
+    # mode='lsd' - проходы по позициям символов справа налево,
+    # mode='msd' - раскладка по первому символу и рекурсивно внутри корзин
+    def radix_sort_isbn(self, mode: str = 'lsd') -> None:
+        if mode == 'lsd':
+            width: int = max((len(book.isbn) for book in self.books), default=0)
+            for position in range(width - 1, -1, -1):
+                self.books = self._distribute(self.books, position)
+        elif mode == 'msd':
+            self.books = self._msd_sort(self.books, 0)
+        else:
+            raise ValueError(f"Неизвестный режим сортировки: {mode}")
+
+    @staticmethod
+    def _distribute(books: List[Book], position: int) -> List[Book]:
+        # Короткий ISBN меньше любого своего продолжения: его "символ" - пустая строка
+        buckets: Dict[str, List[Book]] = {}
+        for book in books:
+            buckets.setdefault(book.isbn[position] if position < len(book.isbn) else '', []).append(book)
+        return [book for char in sorted(buckets) for book in buckets[char]]
+
+    def _msd_sort(self, books: List[Book], position: int) -> List[Book]:
+        if len(books) <= 16:
+            return sorted(books, key=lambda book: book.isbn)
+        buckets: Dict[str, List[Book]] = {}
+        for book in books:
+            buckets.setdefault(book.isbn[position] if position < len(book.isbn) else '', []).append(book)
+        result: List[Book] = []
+        for char in sorted(buckets):
+            # Закончившиеся ISBN равны между собой, их корзина уже упорядочена
+            result.extend(self._msd_sort(buckets[char], position + 1) if char else buckets[char])
+        return result
+
     def is_sorted(self) -> bool:
         return all(self.books[i].isbn <= self.books[i + 1].isbn for i in range(len(self.books) - 1))
 
@@ -93,6 +141,27 @@ def test_books() -> None:
     else:
         print("Книга не найдена.")
 
+    # Тест поразрядных сортировок: результат как у устойчивой сортировки sorted()
+    many: List[Book] = [Book(f"Author{i}", "Publisher", 100 + (i * 37) % 50, i, f"{(i * 7919) % 97}-{'x' * (i % 4)}")
+                        for i in range(300)] + books
+    for mode in ('lsd', 'msd'):
+        array = Array()
+        for book in many:
+            array.add_book(book)
+        array.radix_sort_isbn(mode)
+        assert array.books == sorted(many, key=lambda book: book.isbn), mode
+        assert array.is_sorted()
+    array.counting_sort_pages()
+    assert array.books == sorted(array.books, key=lambda book: book.pages)
+    # Редкие большие значения: сортировка без выделения корзин на весь разброс
+    array.add_book(Book("Tolstoy", "Publisher", 10 ** 9, 100, "ISBN0"))
+    array.add_book(Book("Chekhov", "Publisher", 1, 100, "ISBN7"))
+    array.counting_sort_pages()
+    assert len(array.books) == len(many) + 2
+    assert array.books[0].pages == 1 and array.books[-1].pages == 10 ** 9
+    assert array.books == sorted(array.books, key=lambda book: book.pages)
+    print("\nПоразрядные сортировки работают верно.")
+
 
 def benchmark_books() -> None:
     array: Array = Array()
@@ -115,7 +184,29 @@ def benchmark_books() -> None:
     print(f"Время выполнения поиска: {end - start:.3f} секунд.")
 
 
+def benchmark_sorts() -> None:
+    # Сортировка перемешиванием против поразрядных сортировок по ISBN на разных размерах
+    for n in (100, 1000, 3000, 100000):
+        books: List[Book] = [
+            Book(f"Author{i}", f"Publisher{i}", 300 + (i * 7919) % 1000, i * 10, f"ISBN{(i * 7919) % n:05d}")
+            for i in range(n)
+        ]
+        sorts = [("radix_sort_isbn('lsd')", lambda array: array.radix_sort_isbn('lsd')),
+                 ("radix_sort_isbn('msd')", lambda array: array.radix_sort_isbn('msd'))]
+        if n <= 3000:
+            sorts.insert(0, ("cocktail_sort", Array.cocktail_sort))
+        for name, sort in sorts:
+            array: Array = Array()
+            array.books = list(books)
+            start: float = time.time()
+            sort(array)
+            end: float = time.time()
+            print(f"{name} для {n} книг: {end - start:.5f} секунд.")
+
+
 if __name__ == "__main__":
     test_books()
     print("------------------------------------------")
     benchmark_books()
+    print("------------------------------------------")
+    benchmark_sorts()